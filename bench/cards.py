@@ -0,0 +1,175 @@
+"""Profile card render benchmark and regression check.
+
+Renders every visual tier headless with fake agents and reports mean / p95 wall time,
+peak memory and output size per case, then compares against a baseline.
+
+By default only the machine-independent metrics (output bytes, peak memory) are checked,
+against the committed bench/baseline.json. Timings are always printed but only compared
+with --timings, against bench/baseline.local.json: an untracked baseline recorded on the
+machine that runs the check, since wall times don't carry over between machines.
+
+    python bench/cards.py                     # bytes / peak memory vs the committed baseline
+    python bench/cards.py --update            # re-record them after an intended change
+    python bench/cards.py --timings --update  # record local timings on this machine
+    python bench/cards.py --timings           # compare everything with the local baseline
+    python bench/cards.py --encoding webp --runs 30 --threshold 0.5
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+from collections import namedtuple
+from io import BytesIO
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from PIL import Image  # noqa: E402
+
+from core.cards import BOT_POINTS, ENCODINGS, CardRenderer, encode, prepare_avatar  # noqa: E402
+
+BASELINE = os.path.join(ROOT, "bench", "baseline.json")
+LOCAL_BASELINE = os.path.join(ROOT, "bench", "baseline.local.json")  # untracked, per machine
+PORTABLE = ("peak_kb", "bytes")
+TIMINGS = ("mean_ms", "p95_ms")
+FONT = os.path.join(ROOT, "font.ttf")
+
+FakeAgent = namedtuple("FakeAgent", "id display_name avatar")
+
+
+def _fake_avatar(size=1024):
+    buf = BytesIO()
+    with Image.effect_mandelbrot((size, size), (-2.0, -1.5, 1.0, 1.5), 64) as im:
+        im.convert("RGB").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+RAW_AVATAR = _fake_avatar()
+AGENT = FakeAgent(112233445566778899, "NullPointer", RAW_AVATAR)
+NO_AVATAR = AGENT._replace(avatar=None)
+
+# name -> (agent, rank, points, solves, next_goal, last_cats, earned_role, prepare avatar per run)
+CASES = {
+    "rank1": (AGENT, "#1", 4200, 31, 5000, ["WEB", "PWN", "REV"], "ELITE OPERATIVE", False),
+    "rank2": (AGENT, "#2", 3900, 28, 5000, ["CRYPTO", "WEB"], "ELITE OPERATIVE", False),
+    "rank3": (AGENT, "#3", 3650, 25, 5000, ["FORENSICS"], "FIELD AGENT", False),
+    "top10": (AGENT, "#7", 2100, 14, 2500, ["OSINT", "MISC", "WEB"], "FIELD AGENT", False),
+    "operative": (AGENT, "#42", 350, 3, 500, ["REV"], "RECRUIT", False),
+    "zero_points": (NO_AVATAR, "N/A", 0, 0, 100, [], "RECRUIT", False),
+    "max_clearance": (AGENT, "#5", 9999, 60, None, ["PWN", "PWN", "REV"], "ARCHITECT", False),
+    "bot": (FakeAgent(1, "cyberBOT", RAW_AVATAR), "OVERSEER", BOT_POINTS, "KERNEL", None, ["SYS", "SQL", "ENC"], "SYSTEM OVERSEER", False),
+    "no_avatar": (NO_AVATAR, "#12", 800, 6, 1000, ["WEB"], "FIELD AGENT", False),
+    "cold_avatar": (AGENT, "#12", 800, 6, 1000, ["WEB"], "FIELD AGENT", True),
+    "long_name": (AGENT._replace(display_name="xX_The_Unbelievably_Long_Handle_Xx"), "#8", 1500, 9, 2500, ["MISC"], "FIELD AGENT", False),
+    "unicode_name": (NO_AVATAR._replace(display_name="Ωmega ✦ Δelta ナイト"), "#9", 1400, 8, 2500, ["CRYPTO"], "FIELD AGENT", False),
+}
+
+
+def _peak_kb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 if sys.platform == "darwin" else peak  # bytes on macOS, KB elsewhere
+
+
+def run_case(name, runs, encoding):
+    """Runs one case in the current process; returns its stats."""
+    agent, rank, points, solves, next_goal, cats, role, cold = CASES[name]
+    cards = CardRenderer(FONT)
+    cards.warm()
+    prepared = prepare_avatar(agent.avatar) if agent.avatar else None
+
+    def once():
+        avatar = prepare_avatar(agent.avatar) if cold and agent.avatar else prepared
+        with cards.draw(agent.id, agent.display_name, rank, points, solves, avatar, next_goal, cats, role) as card:
+            return encode(card, encoding)
+
+    once()  # first run fills the sprite cache, like a warm bot
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        data = once()
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    return {
+        "mean_ms": round(statistics.fmean(times), 2),
+        "p95_ms": round(times[min(len(times) - 1, int(len(times) * 0.95))], 2),
+        "peak_kb": round(_peak_kb()),  # whole process: fonts, tier layers, sprites, render
+        "bytes": len(data),
+    }
+
+
+def _child(name, runs, encoding, queue):
+    queue.put(run_case(name, runs, encoding))
+
+
+def measure(name, runs, encoding):
+    """Each case gets a fresh process so its peak memory is not inflated by the others."""
+    ctx = multiprocessing.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_child, args=(name, runs, encoding, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def compare(results, baseline, threshold, metrics=PORTABLE):
+    """Names of (case, metric) that regressed beyond threshold."""
+    failures = []
+    for name, stats in results.items():
+        old = baseline.get(name)
+        if not old: continue
+        for metric in metrics:
+            if old.get(metric) and stats[metric] > old[metric] * (1 + threshold):
+                failures.append((name, metric, old[metric], stats[metric]))
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile card render benchmark")
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--encoding", default="png", choices=sorted(ENCODINGS))
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown / growth (0.25 = +25%%)")
+    parser.add_argument("--update", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--timings", action="store_true", help="also check wall times, against the local baseline")
+    parser.add_argument("cases", nargs="*", help="subset of: " + ", ".join(CASES))
+    args = parser.parse_args(argv)
+
+    names = args.cases or list(CASES)
+    results = {}
+    print(f"{'case':<14} {'mean ms':>9} {'p95 ms':>9} {'peak KB':>9} {'bytes':>9}")
+    for name in names:
+        stats = results[name] = measure(name, args.runs, args.encoding)
+        print(f"{name:<14} {stats['mean_ms']:>9.1f} {stats['p95_ms']:>9.1f} {stats['peak_kb']:>9.0f} {stats['bytes']:>9}")
+
+    path, metrics = (LOCAL_BASELINE, PORTABLE + TIMINGS) if args.timings else (BASELINE, PORTABLE)
+    stored = {}
+    if os.path.exists(path):
+        with open(path) as f: stored = json.load(f)
+
+    if args.update:
+        recorded = {name: {m: stats[m] for m in metrics} for name, stats in results.items()}
+        stored[args.encoding] = {**stored.get(args.encoding, {}), **recorded}
+        with open(path, "w") as f: json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"📝 Baseline updated ({args.encoding}, {os.path.basename(path)}).")
+        return 0
+
+    baseline = stored.get(args.encoding)
+    if not baseline:
+        flags = "--timings --update" if args.timings else "--update"
+        print(f"⚠️ No baseline for '{args.encoding}' in {os.path.basename(path)}. Run with {flags} to record one.")
+        return 0
+    failures = compare(results, baseline, args.threshold, metrics)
+    for name, metric, old, new in failures:
+        print(f"❌ {name}: {metric} {old} -> {new} (+{(new / old - 1) * 100:.0f}%)")
+    if failures:
+        return 1
+    print(f"✅ No regressions beyond +{args.threshold * 100:.0f}%.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
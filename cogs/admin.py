@@ -3,209 +3,291 @@ from discord import app_commands
 from discord.ext import commands
 from discord.ext import tasks
 import aiosqlite
+import asyncio
 import os
 import time
 import shutil
 from datetime import datetime
+from io import BytesIO
 from main import BONUSES
+from core.migrations import migrate
+from core.posts import load_post, is_expired
+
+RECONCILE_PACE = 1.0  # seconds between existence checks in the fallback sweep
+
+
+def _read_file(path):
+    with open(path, 'rb') as f: return f.read()
 
 class Admin(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.db = bot.db
-        self.check_expiry.start()
-        self.check_pending_posts.start()
+        self._reposting = set()  # challenge ids being restored right now
+        self._tracked = set()    # embed + file message ids of posted challenges
+        self.restored = 0
+        self._prepared = {}      # challenge_id -> payload built ahead of its start_time
+        self._release_slots = asyncio.Semaphore(int(os.getenv('RELEASE_CONCURRENCY') or 4))
+        self.last_wave = None    # (missions, channels, makespan seconds)
+        self.reconcile_posts.change_interval(minutes=float(os.getenv('RECONCILE_MINUTES') or 30))
+        self.reconcile_posts.start()
+
+    async def cog_load(self):
+        # Also re-run after /import and wipe_all, which replace every posted challenge
+        self._tracked.clear()
+        async with self.db.execute("SELECT msg_id, file_msg_id FROM flags WHERE posted_at IS NOT NULL") as cursor:
+            for ids in await cursor.fetchall(): self._tracked.update(i for i in ids if i)
 
     def cog_unload(self):
-        self.check_expiry.cancel()
-        self.check_pending_posts.cancel()
+        self.reconcile_posts.cancel()
 
-# --- BACKGROUND TASK: EXPIRES & PERSISTENCE ---
-    @tasks.loop(seconds=60)
-    async def check_expiry(self):
-        # Get active challenges (anything that has been posted)
-        async with self.db.execute("SELECT challenge_id, channel_id, msg_id, file_msg_id, end_time, description, connection_info, file_path, posted_at FROM flags WHERE msg_id IS NOT NULL") as cursor:
-            active_challenges = await cursor.fetchall()
-        
-        current_time = int(time.time())
+# --- DEADLINES: EXPIRY ---
+    # Fired on time by bot.deadlines (core/deadlines.py) when a posted challenge's end_time passes
+    async def expire(self, challenge_id):
+        d = await self.bot.cache.flag(challenge_id)
+        if not d or not d['msg_id'] or not is_expired(d): return
 
-        for challenge_id, channel_id, msg_id, file_msg_id, end_time, description, connection_info, file_path, posted_at in active_challenges:
-            # 1. EXPIRY LOGIC
-            if end_time and current_time >= end_time:
-                # File Cleanup on Expiry
-                if file_path and os.path.exists(file_path):
-                    try:
-                        os.remove(file_path)
-                        print(f"🧹 Deleted file for expired challenge {challenge_id}")
-                    except Exception as e:
-                        print(f"⚠️ Error deleting {file_path}: {e}")
+        # File Cleanup on Expiry
+        file_path = d['file_path']
+        if file_path and os.path.exists(file_path):
+            try:
+                os.remove(file_path)
+                print(f"🧹 Deleted file for expired challenge {challenge_id}")
+            except Exception as e:
+                print(f"⚠️ Error deleting {file_path}: {e}")
+
+        # Check if already marked as expired, from the last embed we sent (no fetch).
+        # Unknown after a restart: the re-render is idempotent and fills the handle.
+        last = self.bot.messages.last(d['msg_id'])
+        if last and last[0] and any("Time Left" in f.name and "🔴 Expired" in f.value for f in last[0].fields):
+            return
 
+        # Queue the card re-render on the refresh scheduler
+        self.bot.refresh.mark_card(challenge_id)
+        print(f"🚨 Expired challenge: {challenge_id}")
+
+# --- ANTI-DELETION ---
+    # Deletions of tracked posts arrive as gateway events and are restored right away.
+    # The ids are only a filter: the owning challenge is looked up when one matches, so
+    # ids left over from re-posts, renames or deleted challenges are harmless.
+    @commands.Cog.listener()
+    async def on_raw_message_delete(self, payload):
+        if payload.message_id in self._tracked:
+            await self.restore_deleted({payload.message_id})
+
+    @commands.Cog.listener()
+    async def on_raw_bulk_message_delete(self, payload):
+        hit = payload.message_ids & self._tracked
+        if hit: await self.restore_deleted(hit)
+
+    async def restore_deleted(self, message_ids):
+        self._tracked -= message_ids
+        challenges = set()
+        for mid in message_ids:
+            async with self.db.execute("SELECT challenge_id FROM flags WHERE msg_id = ? OR file_msg_id = ?", (mid, mid)) as cursor:
+                challenges.update(row[0] for row in await cursor.fetchall())
+        for challenge_id in challenges:
+            try:
+                if await self.repost(challenge_id): self.restored += 1
+            except Exception as e:
+                print(f"❌ Anti-Deletion failed for {challenge_id}: {e}")
+
+    # Fallback for deletions missed while the bot was offline: a slow existence check of
+    # every live post, once at startup and then every RECONCILE_MINUTES.
+    @tasks.loop(minutes=30)
+    async def reconcile_posts(self):
+        async with self.db.execute("SELECT challenge_id, channel_id, msg_id, file_msg_id, end_time, file_path FROM flags WHERE msg_id IS NOT NULL AND posted_at IS NOT NULL") as cursor:
+            live = await cursor.fetchall()
+
+        for challenge_id, channel_id, msg_id, file_msg_id, end_time, file_path in live:
+            if end_time and int(time.time()) >= end_time: continue
+            ids = [msg_id]
+            if file_path and os.path.exists(file_path): ids.append(file_msg_id)
+
+            missing = False
+            for mid in ids:
+                if not mid:
+                    # File path exists but no file_msg_id recorded? Repost to be safe.
+                    missing = True
+                    break
                 try:
-                    channel = self.bot.get_channel(channel_id)
-                    if not channel: continue
-                    
-                    msg = await channel.fetch_message(msg_id)
-                    embed = msg.embeds[0]
-
-                    # Check if already marked as expired
-                    is_expired = False
-                    for field in embed.fields:
-                        if "Time Left" in field.name and "🔴 Expired" in field.value:
-                            is_expired = True
-                            break
-                    
-                    if is_expired: continue
-
-                    # Update via Player Cog helper
-                    cog = self.bot.get_cog('Player')
-                    if cog: await cog.update_challenge_card(challenge_id)
-                    print(f"🚨 Expired challenge: {challenge_id}")
-                except Exception:
-                    pass
-            
-            # 2. PERSISTENCE LOGIC (Anti-Deletion)
-            # If posted and NOT expired
-            elif posted_at is not None and (not end_time or current_time < end_time):
+                    await self.bot.messages.partial(channel_id, mid).fetch()
+                except discord.NotFound:
+                    missing = True
+                    break
+                except discord.HTTPException as e:
+                    print(f"❌ Error in persistence check for {challenge_id}: {e}")
+                    break
+                finally:
+                    await asyncio.sleep(RECONCILE_PACE)
+
+            if missing:
                 try:
-                    channel = self.bot.get_channel(channel_id)
-                    if not channel: continue
-                    
-                    missing = False
-                    # Check Embed
-                    try:
-                        await channel.fetch_message(msg_id)
-                    except discord.NotFound:
-                        missing = True
-                    
-                    # Check File (if applicable)
-                    if not missing and file_path and os.path.exists(file_path):
-                        if file_msg_id:
-                            try:
-                                await channel.fetch_message(file_msg_id)
-                            except discord.NotFound:
-                                missing = True
-                        else:
-                            # File path exists but no file_msg_id recorded? Repost to be safe.
-                            missing = True
-                    
-                    if missing:
-                        # Message missing! Re-post immediately
-                        print(f"🔄 Anti-Deletion: Re-posting challenge {challenge_id}...")
-                        
-                        # Full Clean Recovery: Attempt to delete remaining message
-                        try:
-                            old_msg = await channel.fetch_message(msg_id)
-                            await old_msg.delete()
-                        except: pass
-                        
-                        if file_msg_id:
-                            try:
-                                old_f_msg = await channel.fetch_message(file_msg_id)
-                                await old_f_msg.delete()
-                            except: pass
-
-                        await self.perform_post(challenge_id, channel, description, connection_info, end_time, file_path=file_path)
+                    if await self.repost(challenge_id): self.restored += 1
                 except Exception as e:
-                    print(f"❌ Error in persistence check for {challenge_id}: {e}")
+                    print(f"❌ Anti-Deletion failed for {challenge_id}: {e}")
 
-    @check_expiry.before_loop
-    async def before_check_expiry(self):
+    @reconcile_posts.before_loop
+    async def before_reconcile_posts(self):
         await self.bot.wait_until_ready()
 
-# --- BACKGROUND TASK: CHECKS PENDING POSTS ---
-    @tasks.loop(seconds=60)
-    async def check_pending_posts(self):
-        current_time = int(time.time())
-        # Check for rows where posted_at is NULL and current_time >= start_time
-        async with self.db.execute(
-            "SELECT challenge_id, channel_id, description, connection_info, end_time, file_path FROM flags WHERE posted_at IS NULL AND start_time <= ?", 
-            (current_time,)
-        ) as cursor:
-            pending = await cursor.fetchall()
-
-        for row in pending:
-            challenge_id, target_channel_id, description, connection_info, end_time, file_path = row
-            try:
-                target_channel = self.bot.get_channel(target_channel_id)
-                if not target_channel:
-                    print(f"⚠️ Scheduled post for {challenge_id} failed: Channel {target_channel_id} not found.")
-                    continue
+    async def repost(self, challenge_id):
+        """Re-posts a live challenge whose embed or file message went missing."""
+        # A delete event, the sweep and a failed card edit can all notice the same deletion
+        if challenge_id in self._reposting: return False
+        d = await self.bot.cache.flag(challenge_id)
+        if not d or d['posted_at'] is None or is_expired(d): return False
+        channel = self.bot.get_channel(d['channel_id'])
+        if not channel: return False
+        print(f"🔄 Anti-Deletion: Re-posting challenge {challenge_id}...")
+        self._reposting.add(challenge_id)
+        try:
+            # Full Clean Recovery: delete whichever half is left (one DELETE each, no fetch)
+            for mid in (d['msg_id'], d['file_msg_id']):
+                if not mid: continue
+                self._tracked.discard(mid)  # our own delete is not a deletion to undo
+                try: await self.bot.messages.delete(channel.id, mid)
+                except discord.HTTPException: pass
+
+            return await self.perform_post(challenge_id, channel, d['description'], d['connection_info'], d['end_time'], file_path=d['file_path'])
+        finally:
+            self._reposting.discard(challenge_id)
+
+    async def sync_hint_button(self, challenge_id, channel_id, msg_id, show):
+        """Adds or removes the Hints button on a live post. True if the post changed."""
+        last = self.bot.messages.last(msg_id)
+        if not last or not last[1]:
+            # Not posted or edited by this process: rebuild the whole card from the database
+            cog = self.bot.get_cog('Player')
+            return bool(cog) and await cog.update_challenge_card(challenge_id)
+
+        hint_id = f"hints:{challenge_id}"
+        children = [c for c in last[1].children if getattr(c, 'custom_id', None) != hint_id]
+        if (len(children) != len(last[1].children)) == show: return False  # already as wanted
 
-                await self.perform_post(challenge_id, target_channel, description, connection_info, end_time, file_path=file_path)
+        # Same order as challenge_post (Submit, Hints, Solvers), so a later refresh of the
+        # card builds an identical payload and its edit is skipped
+        if show: children.insert(1, discord.ui.Button(label="Hints", style=discord.ButtonStyle.gray, emoji="💡", custom_id=hint_id))
+        view = discord.ui.View(timeout=None)
+        for child in children: view.add_item(child)
+        return await self.bot.messages.edit(channel_id, msg_id, view=view)
+
+# --- DEADLINES: SCHEDULED POSTS ---
+    # Missions sharing a start_time go out as one release wave. Their payloads (embed, view,
+    # attachment bytes) are built PREPARE_LEAD seconds early, channels are posted to
+    # concurrently (RELEASE_CONCURRENCY sends in flight) while each channel keeps its own
+    # order (embed, then file, mission after mission). Each channel's msg_ids are written in
+    # one write job as soon as its missions are sent, so a failure elsewhere in the wave
+    # never gets an already-posted mission retried (and posted twice).
+    async def prepare(self, challenge_ids):
+        for challenge_id in challenge_ids:
+            d = await self.bot.cache.flag(challenge_id)
+            if not d or d['posted_at'] is not None: continue
+            try:
+                self._prepared[challenge_id] = await self._build_payload(d)
+            except Exception as e:
+                print(f"⚠️ Could not prepare {challenge_id}: {e}")
+
+    async def _build_payload(self, d):
+        channel = self.bot.get_channel(d['channel_id'])
+        embed, view = await load_post(self.db, d, channel.guild if channel else None, BONUSES.get(0, 0))
+        data = None
+        if d['file_path'] and os.path.exists(d['file_path']):
+            data = await asyncio.get_running_loop().run_in_executor(None, _read_file, d['file_path'])
+        return d, embed, view, data
+
+    async def release(self, challenge_ids):
+        """Posts due challenges as one wave. Returns the ids to retry later."""
+        start = time.perf_counter()
+        failed, waves = [], {}   # channel -> [(challenge_id, payload)] in release order
+        for challenge_id in challenge_ids:
+            d = await self.bot.cache.flag(challenge_id)
+            if not d or d['posted_at'] is not None: continue
+            target_channel = self.bot.get_channel(d['channel_id'])
+            if not target_channel:
+                print(f"⚠️ Scheduled post for {challenge_id} failed: Channel {d['channel_id']} not found.")
+                failed.append(challenge_id)
+                continue
+            # Rebuilt if the challenge was edited after it was prepared
+            payload = self._prepared.pop(challenge_id, None)
+            if not payload or payload[0] != d: payload = await self._build_payload(d)
+            waves.setdefault(target_channel, []).append((challenge_id, payload))
+
+        posted = []
+        async def post_channel(target_channel, queue):
+            sent = []
+            for challenge_id, (d, embed, view, data) in queue:
+                async with self._release_slots:
+                    try:
+                        f = discord.File(BytesIO(data), filename=os.path.basename(d['file_path'])) if data else None
+                        msg_id, file_msg_id = await self._send_post(target_channel, embed, view, f)
+                    except Exception as e:
+                        print(f"❌ Error posting scheduled challenge {challenge_id}: {e}")
+                        failed.append(challenge_id)
+                        continue
+                sent.append((challenge_id, msg_id, file_msg_id, target_channel.id))
                 print(f"📅 Automatically posted scheduled challenge: {challenge_id}")
+            if not sent: return
+            # These are live now: a failed write is reported, never retried as a new post
+            try:
+                await self._record_posts(sent)
             except Exception as e:
-                print(f"❌ Error in check_pending_posts for {challenge_id}: {e}")
+                print(f"❌ Posted but could not record {', '.join(c for c, *_ in sent)}: {e}")
+            posted.extend(sent)
 
-    @check_pending_posts.before_loop
-    async def before_check_pending_posts(self):
-        await self.bot.wait_until_ready()
+        await asyncio.gather(*(post_channel(c, q) for c, q in waves.items()))
+        if posted:
+            makespan = time.perf_counter() - start
+            self.last_wave = (len(posted), len(waves), makespan)
+            print(f"🚀 Released {len(posted)} missions across {len(waves)} channels in {makespan:.2f}s")
+        return failed
+
+    async def _send_post(self, target_channel, embed, view, file=None):
+        msg = await target_channel.send(embed=embed, view=view)
+        self.bot.messages.remember(msg.id, embed, view)
+
+        file_msg = None
+        # Embed first, File second. DO NOT delete the local file - it's needed for anti-deletion re-posts
+        if file:
+            try:
+                file_msg = await target_channel.send(file=file)
+            except Exception as e:
+                print(f"⚠️ Error sending file {file.filename}: {e}")
+        return msg.id, file_msg.id if file_msg else None
+
+    async def _record_posts(self, posted):
+        """posted: [(challenge_id, msg_id, file_msg_id, channel_id)], written as one write job."""
+        current_time = int(time.time())
+        for _, msg_id, file_msg_id, _ in posted:
+            self._tracked.update(i for i in (msg_id, file_msg_id) if i)
+        await self.bot.writer.executemany("UPDATE flags SET msg_id = ?, file_msg_id = ?, channel_id = ?, posted_at = ? WHERE challenge_id = ?",
+                [(msg_id, file_msg_id, channel_id, current_time, challenge_id) for challenge_id, msg_id, file_msg_id, channel_id in posted])
+        self.bot.cache.invalidate("flags")
+        for challenge_id, *_ in posted:
+            await self.bot.deadlines.reschedule(challenge_id)  # now waiting for end_time
 
     async def perform_post(self, challenge_id, target_channel, description, connection_info, end_time, file=None, file_path=None):
         """Logic to actually post the challenge to Discord and update DB"""
-        async with self.db.execute("SELECT points, image_url, category FROM flags WHERE challenge_id = ?", (challenge_id,)) as cursor:
-            data = await cursor.fetchone()
-        
-        if not data:
-            return False
-
-        points, image_url, category = data
-        if not category: category = "General"
-        if not description: description = "Solve it."
-        
-        final_desc = f"**Objective:**\n```text\n{description}\n```"
-        if connection_info:
-            final_desc += f"\n**📡 Connection:**\n```text\n{connection_info}\n```"
-
-        embed = discord.Embed(
-            title=f"🛡️ MISSION: {challenge_id}",
-            description=final_desc,
-            color=discord.Color.red()
-        )
-        embed.add_field(name="💰 Bounty", value=f"**{points} Points**", inline=True)
-        embed.add_field(name="📂 Category", value=f"**{category}**", inline=True)
-        embed.add_field(name="⏳ Time Left", value=f"<t:{end_time}:R>", inline=True)
-        embed.add_field(name="🩸 First Blood", value="*Waiting...*", inline=False) 
-
-        if image_url:
-            embed.set_image(url=image_url)
-        if file or file_path:
-            embed.set_footer(text="📁 See attached file below")
-        
-        # --- LOGIC TO CHECK IF HINTS EXIST ---
-        async with self.db.execute("SELECT COUNT(*) FROM hints WHERE challenge_id = ?", (challenge_id,)) as cursor:
+        async with self.db.execute("SELECT * FROM flags WHERE challenge_id = ?", (challenge_id,)) as cursor:
             row = await cursor.fetchone()
-            has_hints = row[0] > 0
-
-        # BUTTONS
-        view = discord.ui.View(timeout=None)
-        btn_flag = discord.ui.Button(label="Submit Flag", style=discord.ButtonStyle.green, emoji="🚩", custom_id=f"submit:{challenge_id}")
-        btn_hint = discord.ui.Button(label="Hints", style=discord.ButtonStyle.gray, emoji="💡", custom_id=f"hints:{challenge_id}")
         
-        view.add_item(btn_flag)
-        if has_hints:
-            view.add_item(btn_hint)
+        if not row:
+            return False
 
-        msg = await target_channel.send(embed=embed, view=view)
+        # Same builder as the card refresh, so the first refresh after posting is a no-op
+        d = dict(row)
+        d.update(description=description, connection_info=connection_info, end_time=end_time, file_path=file_path or (file and file.filename))
+        embed, view = await load_post(self.db, d, target_channel.guild, BONUSES.get(0, 0))
 
-        file_msg = None
-        # Handle file attachment (Embed first, File second)
+        # Handle file attachment, or the scheduled local file
+        f = None
         if file:
             f = await file.to_file()
-            file_msg = await target_channel.send(file=f)
-        # Handle scheduled local file
         elif file_path and os.path.exists(file_path):
-            try:
-                f = discord.File(file_path)
-                file_msg = await target_channel.send(file=f)
-                # DO NOT delete local file - it's needed for anti-deletion re-posts
-            except Exception as e:
-                print(f"⚠️ Error sending scheduled file {file_path}: {e}")
+            f = discord.File(file_path)
 
-        current_time = int(time.time())
-        file_msg_id = file_msg.id if file_msg else None
-        await self.db.execute("UPDATE flags SET msg_id = ?, file_msg_id = ?, channel_id = ?, posted_at = ? WHERE challenge_id = ?", 
-                (msg.id, file_msg_id, target_channel.id, current_time, challenge_id))
-        await self.db.commit()
+        msg_id, file_msg_id = await self._send_post(target_channel, embed, view, f)
+        await self._record_posts([(challenge_id, msg_id, file_msg_id, target_channel.id)])
         return True
 
     # --- 0. SETUP COMMANDS ---
@@ -228,28 +310,30 @@ class Admin(commands.Cog):
         
         await interaction.response.defer(ephemeral=True)
         
-        updates = []
+        updates, writes = [], []
         if leaderboard_channel: 
-            await self.db.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('channel_leaderboard', ?)", (leaderboard_channel.id,))
+            writes.append(('channel_leaderboard', leaderboard_channel.id))
             updates.append(f"✅ Leaderboard Channel: {leaderboard_channel.mention}")
         
         if challenge_logs:
-            await self.db.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('channel_challenge_logs', ?)", (challenge_logs.id,))
+            writes.append(('channel_challenge_logs', challenge_logs.id))
             updates.append(f"✅ Challenge Logs: {challenge_logs.mention}")
 
         if wrong_submissions:
-            await self.db.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('channel_wrong_submissions', ?)", (wrong_submissions.id,))
+            writes.append(('channel_wrong_submissions', wrong_submissions.id))
             updates.append(f"✅ Wrong Submissions: {wrong_submissions.mention}")
 
         if general_channel:
-            await self.db.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('channel_general', ?)", (general_channel.id,))
+            writes.append(('channel_general', general_channel.id))
             updates.append(f"✅ General Channel: {general_channel.mention}")
 
         if champion_role:
-            await self.db.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('role_champion', ?)", (champion_role.id,))
+            writes.append(('role_champion', champion_role.id))
             updates.append(f"👑 Champion Role: **{champion_role.name}**")
 
-        await self.db.commit()
+        if writes:
+            await self.bot.writer.executemany("INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)", writes)
+        self.bot.cache.invalidate("config")
 
         if not updates:
             await interaction.followup.send("⚠️ No settings changed. Please select options to configure.")
@@ -260,20 +344,19 @@ class Admin(commands.Cog):
     @app_commands.describe(role="The role to assign", points="Points required to earn this role")
     @app_commands.default_permissions(administrator=True)
     async def set_rank_role(self, interaction: discord.Interaction, role: discord.Role, points: int):
-        await self.db.execute("INSERT OR REPLACE INTO role_rewards (role_id, points) VALUES (?, ?)", (role.id, points))
-        await self.db.commit()
+        await self.bot.writer.execute("INSERT OR REPLACE INTO role_rewards (role_id, points) VALUES (?, ?)", (role.id, points))
+        self.bot.cache.invalidate("role_rewards")
         await interaction.response.send_message(f"✅ **Rank Role Set:** {role.mention} now requires **{points} points**.", ephemeral=True)
 
     @app_commands.command(name="remove_rank_role", description="Deletes a role from the auto-assignment list")
     @app_commands.describe(role="The role to remove")
     @app_commands.default_permissions(administrator=True)
     async def remove_rank_role(self, interaction: discord.Interaction, role: discord.Role):
-        async with self.db.execute("DELETE FROM role_rewards WHERE role_id = ?", (role.id,)) as cursor:
-            if cursor.rowcount > 0:
-                await self.db.commit()
-                await interaction.response.send_message(f"🗑️ **Rank Role Removed:** {role.mention} has been deleted from rewards.", ephemeral=True)
-            else:
-                await interaction.response.send_message(f"⚠️ {role.mention} was not in the rank rewards list.", ephemeral=True)
+        if await self.bot.writer.execute("DELETE FROM role_rewards WHERE role_id = ?", (role.id,)) > 0:
+            self.bot.cache.invalidate("role_rewards")
+            await interaction.response.send_message(f"🗑️ **Rank Role Removed:** {role.mention} has been deleted from rewards.", ephemeral=True)
+        else:
+            await interaction.response.send_message(f"⚠️ {role.mention} was not in the rank rewards list.", ephemeral=True)
 
     @app_commands.command(name="list_rank_roles", description="Lists all configured roles and their required points")
     @app_commands.default_permissions(administrator=True)
@@ -297,9 +380,10 @@ class Admin(commands.Cog):
     @app_commands.command(name="reset_config", description="Wipe all channel/role configurations")
     @app_commands.default_permissions(administrator=True)
     async def reset_config(self, interaction: discord.Interaction):
-        await self.db.execute("DELETE FROM config")
-        await self.db.execute("DELETE FROM role_rewards")
-        await self.db.commit()
+        async with self.bot.writer.transaction() as db:
+            await db.execute("DELETE FROM config")
+            await db.execute("DELETE FROM role_rewards")
+        self.bot.cache.invalidate("config", "role_rewards")
         await interaction.response.send_message("🔄 **Config & Rank Roles Reset!** Run `/setup` and `/set_rank_role` to re-configure.", ephemeral=True)
 
     @app_commands.command(name="wipe_all", description="⚠️ NUCLEAR: Delete EVERYTHING (Players, Flags, Solves)")
@@ -309,6 +393,7 @@ class Admin(commands.Cog):
 
         db_ref = self.db
         bot_ref = self.bot
+        admin_ref = self
 
         class WipeModal(discord.ui.Modal, title="☢️  NUCLEAR WIPEOUT — CONFIRM"):
             confirm_input = discord.ui.TextInput(
@@ -329,15 +414,13 @@ class Admin(commands.Cog):
 
                 await modal_interaction.response.defer(ephemeral=True)
 
-                await db_ref.execute("DELETE FROM flags")
-                await db_ref.execute("DELETE FROM scores")
-                await db_ref.execute("DELETE FROM solves")
-                await db_ref.execute("DELETE FROM banlist")
-                await db_ref.execute("DELETE FROM hints")
-                await db_ref.execute("DELETE FROM unlocked_hints")
-                await db_ref.execute("DELETE FROM config")
-                await db_ref.execute("DELETE FROM role_rewards")
-                await db_ref.commit()
+                async with bot_ref.writer.transaction() as db:
+                    for table in ("flags", "scores", "solves", "banlist", "hints", "unlocked_hints", "config", "role_rewards", "wrong_attempts"):
+                        await db.execute(f"DELETE FROM {table}")
+                bot_ref.cache.invalidate()
+                await bot_ref.ranking.load(db_ref)
+                await bot_ref.deadlines.load(db_ref)
+                await admin_ref.cog_load()  # anti-deletion ids
 
                 if os.path.exists('uploads'):
                     try:
@@ -346,12 +429,7 @@ class Admin(commands.Cog):
                     except Exception as e:
                         print(f"❌ Storage Wipe Error: {e}")
 
-                cog = bot_ref.get_cog('Player')
-                if cog:
-                    try:
-                        await cog.update_leaderboard()
-                    except Exception:
-                        pass
+                bot_ref.refresh.mark_leaderboard()
 
                 await modal_interaction.followup.send(
                     "☢️ **NUCLEAR WIPEOUT COMPLETE.**\nThe database and local storage are empty.",
@@ -383,9 +461,9 @@ class Admin(commands.Cog):
         await interaction.response.defer(ephemeral=True)
 
         try:
-            await self.db.execute("INSERT INTO flags (challenge_id, points, flag_text, category, image_url) VALUES (?, ?, ?, ?, ?)", 
+            await self.bot.writer.execute("INSERT INTO flags (challenge_id, points, flag_text, category, image_url) VALUES (?, ?, ?, ?, ?)", 
                     (challenge_id, points, flag, category, image_url))
-            await self.db.commit()
+            self.bot.cache.invalidate("flags")
             msg = f"✅ Created **{category}** challenge **{challenge_id}** ({points} pts)"
         except aiosqlite.IntegrityError:
             msg = f"⚠️ Challenge **{challenge_id}** already exists!"
@@ -408,27 +486,20 @@ class Admin(commands.Cog):
             return
 
         cid, channel_id, msg_id = row
+        self._prepared.pop(challenge_id, None)  # a prepared payload would lack the button
 
         # Insert the hint
-        async with self.db.execute("INSERT INTO hints (challenge_id, hint_text, cost) VALUES (?, ?, ?)", (challenge_id, text, cost)) as cursor:
-            hint_id = cursor.lastrowid
-        await self.db.commit()
+        async def insert_hint(db):
+            async with db.execute("INSERT INTO hints (challenge_id, hint_text, cost) VALUES (?, ?, ?)", (challenge_id, text, cost)) as cursor:
+                return cursor.lastrowid
+        hint_id = await self.bot.writer.run(insert_hint)
         
         # --- UPDATE DISCORD MESSAGE IF IT EXISTS ---
         update_status = ""
         if channel_id and msg_id:
             try:
-                ch = self.bot.get_channel(channel_id)
-                if ch:
-                    msg = await ch.fetch_message(msg_id)
-                    view = discord.ui.View.from_message(msg)
-                    has_hint_btn = any(child.custom_id == f"hints:{challenge_id}" for child in view.children if hasattr(child, "custom_id"))
-                    
-                    if not has_hint_btn:
-                        btn_hint = discord.ui.Button(label="Hints", style=discord.ButtonStyle.gray, emoji="💡", custom_id=f"hints:{challenge_id}")
-                        view.add_item(btn_hint)
-                        await msg.edit(view=view)
-                        update_status = "\n💡 **Button added to live post!**"
+                if await self.sync_hint_button(challenge_id, channel_id, msg_id, show=True):
+                    update_status = "\n💡 **Button added to live post!**"
             except Exception as e:
                 update_status = f"\n⚠️ Could not update live post: {e}"
 
@@ -450,20 +521,22 @@ class Admin(commands.Cog):
             return
         
         challenge_id, cost = hint_row
+        self._prepared.pop(challenge_id, None)
 
-        # 2. Identify buyers for refund
-        async with self.db.execute("SELECT user_id FROM unlocked_hints WHERE hint_id = ?", (hint_id,)) as cursor:
-            buyers = await cursor.fetchall()
-        
-        # 3. Process Refunds
-        if buyers:
-            await self.db.executemany("UPDATE scores SET points = points + ? WHERE user_id = ?", 
+        async with self.bot.writer.transaction() as db:
+            # 2. Identify buyers for refund
+            async with db.execute("SELECT user_id FROM unlocked_hints WHERE hint_id = ?", (hint_id,)) as cursor:
+                buyers = await cursor.fetchall()
+            
+            # 3. Process Refunds
+            if buyers:
+                await db.executemany("UPDATE scores SET points = points + ? WHERE user_id = ?", 
                                      [(cost, uid[0]) for uid in buyers])
-        
-        # 4. Delete hint and unlock records
-        await self.db.execute("DELETE FROM unlocked_hints WHERE hint_id = ?", (hint_id,))
-        await self.db.execute("DELETE FROM hints WHERE id = ?", (hint_id,))
-        await self.db.commit()
+            
+            # 4. Delete hint and unlock records
+            await db.execute("DELETE FROM unlocked_hints WHERE hint_id = ?", (hint_id,))
+            await db.execute("DELETE FROM hints WHERE id = ?", (hint_id,))
+        await self.bot.ranking.refresh(self.db, [uid[0] for uid in buyers])
 
         # 5. Check if any hints remain for this challenge to update UI
         update_status = ""
@@ -477,23 +550,13 @@ class Admin(commands.Cog):
             
             if flag_row and flag_row[0] and flag_row[1]:
                 try:
-                    ch = self.bot.get_channel(flag_row[0])
-                    if ch:
-                        msg = await ch.fetch_message(flag_row[1])
-                        view = discord.ui.View.from_message(msg)
-                        # Remove hint button
-                        new_children = [c for c in view.children if not (hasattr(c, "custom_id") and c.custom_id == f"hints:{challenge_id}")]
-                        if len(new_children) != len(view.children):
-                            view.clear_items()
-                            for child in new_children: view.add_item(child)
-                            await msg.edit(view=view)
-                            update_status = "\n🗑️ **Hints button removed from live post.**"
+                    if await self.sync_hint_button(challenge_id, flag_row[0], flag_row[1], show=False):
+                        update_status = "\n🗑️ **Hints button removed from live post.**"
                 except Exception:
                     pass
 
         # 6. Refresh Leaderboard
-        cog = self.bot.get_cog('Player')
-        if cog: await cog.update_leaderboard()
+        self.bot.refresh.mark_leaderboard()
 
         await interaction.followup.send(f"🗑️ **Hint #{hint_id} removed.**\n💰 Refunded {cost} points to {len(buyers)} players.{update_status}")
 
@@ -547,11 +610,12 @@ class Admin(commands.Cog):
                 file_path = f"uploads/{challenge_id}_{file.filename}"
                 await file.save(file_path)
 
-            await self.db.execute(
+            await self.bot.writer.execute(
                 "UPDATE flags SET start_time = ?, end_time = ?, channel_id = ?, description = ?, connection_info = ?, posted_at = NULL, file_path = ? WHERE challenge_id = ?",
                 (start_ts, end_ts, target_channel.id, description, connection_info, file_path, challenge_id)
             )
-            await self.db.commit()
+            self.bot.cache.invalidate("flags")
+            await self.bot.deadlines.reschedule(challenge_id)
             await interaction.response.send_message(f"📅 **Scheduled!** **{challenge_id}** will be posted to {target_channel.mention} at <t:{start_ts}:F>.", ephemeral=True)
         else:
             # Immediate post
@@ -564,15 +628,21 @@ class Admin(commands.Cog):
                 await file.save(file_path)
 
             # Update DB with times and file_path
-            await self.db.execute("UPDATE flags SET start_time = ?, end_time = ?, description = ?, connection_info = ?, file_path = ? WHERE challenge_id = ?",
+            await self.bot.writer.execute("UPDATE flags SET start_time = ?, end_time = ?, description = ?, connection_info = ?, file_path = ? WHERE challenge_id = ?",
                                  (start_ts, end_ts, description, connection_info, file_path, challenge_id))
-            await self.db.commit()
+            self.bot.cache.invalidate("flags")
             
-            success = await self.perform_post(challenge_id, target_channel, description, connection_info, end_ts, file_path=file_path)
+            try:
+                success = await self.perform_post(challenge_id, target_channel, description, connection_info, end_ts, file_path=file_path)
+            except Exception as e:
+                print(f"❌ Immediate post of {challenge_id} failed: {e}")
+                success = False
             if success:
                 await interaction.followup.send(f"✅ Posted **{challenge_id}** immediately!")
             else:
-                await interaction.followup.send(f"❌ Failed to post **{challenge_id}**.")
+                # Still unposted with a start_time in the past: the deadline scheduler retries it
+                await self.bot.deadlines.reschedule(challenge_id)
+                await interaction.followup.send(f"❌ Failed to post **{challenge_id}**. It will be retried automatically.")
 
     # --- 4. LIST CHALLENGES ---
     @app_commands.command(name="list", description="List all created challenges")
@@ -629,75 +699,74 @@ class Admin(commands.Cog):
 
         base_points, channel_id, msg_id, file_msg_id, file_path = flag_data
 
-        # 2. Deduct Points from Solvers
-        async with self.db.execute("SELECT user_id FROM solves WHERE challenge_id = ? ORDER BY timestamp ASC", (challenge_id,)) as cursor:
-            solvers = await cursor.fetchall()
-        
-        deductions = []
-        for i, (user_id,) in enumerate(solvers):
-            bonus = BONUSES.get(i, 0)
-            total_deduction = base_points + bonus
-            deductions.append((total_deduction, user_id))
-
-        if deductions:
-            await self.db.executemany("UPDATE scores SET points = points - ? WHERE user_id = ?", deductions)
-        
-        # Refund Hints
-        async with self.db.execute("""
-            SELECT uh.user_id, h.cost 
-            FROM unlocked_hints uh 
-            JOIN hints h ON uh.hint_id = h.id 
-            WHERE h.challenge_id = ?
-        """, (challenge_id,)) as cursor:
-            refunds = await cursor.fetchall()
-        
-        if refunds:
-            await self.db.executemany("UPDATE scores SET points = points + ? WHERE user_id = ?", 
+        async with self.bot.writer.transaction() as db:
+            # 2. Deduct Points from Solvers
+            async with db.execute("SELECT user_id FROM solves WHERE challenge_id = ? ORDER BY timestamp ASC", (challenge_id,)) as cursor:
+                solvers = await cursor.fetchall()
+            
+            deductions = []
+            for i, (user_id,) in enumerate(solvers):
+                bonus = BONUSES.get(i, 0)
+                total_deduction = base_points + bonus
+                deductions.append((total_deduction, user_id))
+
+            if deductions:
+                await db.executemany("UPDATE scores SET points = points - ? WHERE user_id = ?", deductions)
+            
+            # Refund Hints
+            async with db.execute("""
+                SELECT uh.user_id, h.cost 
+                FROM unlocked_hints uh 
+                JOIN hints h ON uh.hint_id = h.id 
+                WHERE h.challenge_id = ?
+            """, (challenge_id,)) as cursor:
+                refunds = await cursor.fetchall()
+            
+            if refunds:
+                await db.executemany("UPDATE scores SET points = points + ? WHERE user_id = ?", 
                                      [(cost, uid) for uid, cost in refunds])
 
-        # 3. File Cleanup
+            # 3. Delete Data
+            await db.execute("DELETE FROM flags WHERE challenge_id = ?", (challenge_id,))
+            await db.execute("DELETE FROM solves WHERE challenge_id = ?", (challenge_id,))
+            if deductions:
+                # Keep the denormalized leaderboard columns in step with the remaining solves
+                await db.executemany("""
+                    UPDATE scores SET solve_count = solve_count - 1,
+                        last_solve_ts = (SELECT MAX(timestamp) FROM solves WHERE user_id = scores.user_id)
+                    WHERE user_id = ?""", [(uid,) for _, uid in deductions])
+            await db.execute("DELETE FROM unlocked_hints WHERE hint_id IN (SELECT id FROM hints WHERE challenge_id = ?)", (challenge_id,))
+            await db.execute("DELETE FROM hints WHERE challenge_id = ?", (challenge_id,))
+
+        # 4. File Cleanup
         if file_path and os.path.exists(file_path):
             try:
                 os.remove(file_path)
             except Exception as e:
                 print(f"⚠️ Failed to delete local file {file_path}: {e}")
 
-        # 4. Delete Data
-        await self.db.execute("DELETE FROM flags WHERE challenge_id = ?", (challenge_id,))
-        await self.db.execute("DELETE FROM solves WHERE challenge_id = ?", (challenge_id,))
-        await self.db.execute("DELETE FROM unlocked_hints WHERE hint_id IN (SELECT id FROM hints WHERE challenge_id = ?)", (challenge_id,))
-        await self.db.execute("DELETE FROM hints WHERE challenge_id = ?", (challenge_id,))
-        await self.db.commit()
+        self.bot.cache.invalidate("flags")
+        await self.bot.deadlines.reschedule(challenge_id)
+        await self.bot.ranking.refresh(self.db, [uid for _, uid in deductions] + [uid for uid, _ in refunds])
         
         # 5. Delete Discord Post
         post_status = ""
         if channel_id:
             try:
-                ch = self.bot.get_channel(channel_id)
-                if ch:
-                    if msg_id:
-                        try:
-                            m = await ch.fetch_message(msg_id)
-                            await m.delete()
-                            post_status += " (Embed deleted)"
-                        except:
-                            post_status += " (Embed not found)"
-                    
-                    if file_msg_id:
-                        try:
-                            fm = await ch.fetch_message(file_msg_id)
-                            await fm.delete()
-                            post_status += " (File deleted)"
-                        except:
-                            post_status += " (File not found)"
+                if msg_id:
+                    deleted = await self.bot.messages.delete(channel_id, msg_id)
+                    post_status += " (Embed deleted)" if deleted else " (Embed not found)"
+
+                if file_msg_id:
+                    deleted = await self.bot.messages.delete(channel_id, file_msg_id)
+                    post_status += " (File deleted)" if deleted else " (File not found)"
             except Exception as e:
                 post_status = f" (Deletion error: {e})"
         
         if not post_status: post_status = " (No post to delete)"
 
         # 6. Refresh Leaderboard
-        cog = self.bot.get_cog('Player')
-        if cog: await cog.update_leaderboard()
+        self.bot.refresh.mark_leaderboard()
 
         await interaction.followup.send(f"🗑️ **Deleted {challenge_id}**\n🔻 Points removed from {len(deductions)} players.\n💰 Refunds processed for {len(refunds)} hint unlocks.\n{post_status}")
 
@@ -770,27 +839,28 @@ class Admin(commands.Cog):
         try:
             # 1. Handle Rename
             current_id = challenge_id
-            if new_id and new_id != challenge_id:
-                await self.db.execute("UPDATE flags SET challenge_id = ? WHERE challenge_id = ?", (new_id, challenge_id))
-                await self.db.execute("UPDATE solves SET challenge_id = ? WHERE challenge_id = ?", (new_id, challenge_id))
-                await self.db.execute("UPDATE hints SET challenge_id = ? WHERE challenge_id = ?", (new_id, challenge_id))
-                current_id = new_id
-
-            # 2. Apply Other Updates
-            if updates:
-                params.append(current_id)
-                await self.db.execute(f"UPDATE flags SET {', '.join(updates)} WHERE challenge_id = ?", tuple(params))
+            async with self.bot.writer.transaction() as db:
+                if new_id and new_id != challenge_id:
+                    await db.execute("UPDATE flags SET challenge_id = ? WHERE challenge_id = ?", (new_id, challenge_id))
+                    await db.execute("UPDATE solves SET challenge_id = ? WHERE challenge_id = ?", (new_id, challenge_id))
+                    await db.execute("UPDATE hints SET challenge_id = ? WHERE challenge_id = ?", (new_id, challenge_id))
+                    current_id = new_id
+
+                # 2. Apply Other Updates
+                if updates:
+                    params.append(current_id)
+                    await db.execute(f"UPDATE flags SET {', '.join(updates)} WHERE challenge_id = ?", tuple(params))
             
-            await self.db.commit()
+            self.bot.cache.invalidate("flags")
+            if current_id != challenge_id: await self.bot.deadlines.reschedule(challenge_id)
+            await self.bot.deadlines.reschedule(current_id)
 
             # 3. Synchronize Visuals
-            cog_player = self.bot.get_cog('Player')
-            if points is not None and cog_player:
-                await cog_player.update_leaderboard()
+            if points is not None:
+                self.bot.refresh.mark_leaderboard()
             
             # Update Live Embed if posted
-            if cog_player:
-                await cog_player.update_challenge_card(current_id)
+            self.bot.refresh.mark_card(current_id)
 
             await interaction.followup.send(f"✅ **{challenge_id}** updated successfully" + (f" (Renamed to **{new_id}**)" if new_id else "."))
         except aiosqlite.IntegrityError:
@@ -831,15 +901,17 @@ class Admin(commands.Cog):
         deduction = base_points + bonus
         
         # 4. Remove Solve and Deduct Points
-        await self.db.execute("DELETE FROM solves WHERE user_id = ? AND challenge_id = ?", (member.id, challenge_id))
-        await self.db.execute("UPDATE scores SET points = points - ? WHERE user_id = ?", (deduction, member.id))
-        await self.db.commit()
+        async with self.bot.writer.transaction() as db:
+            await db.execute("DELETE FROM solves WHERE user_id = ? AND challenge_id = ?", (member.id, challenge_id))
+            await db.execute("""
+                UPDATE scores SET points = points - ?, solve_count = solve_count - 1,
+                    last_solve_ts = (SELECT MAX(timestamp) FROM solves WHERE user_id = scores.user_id)
+                WHERE user_id = ?""", (deduction, member.id))
+        await self.bot.ranking.refresh(self.db, [member.id])
 
         # Update visuals
-        cog = self.bot.get_cog('Player')
-        if cog:
-            await cog.update_leaderboard()
-            await cog.update_challenge_card(challenge_id)
+        self.bot.refresh.mark_leaderboard()
+        self.bot.refresh.mark_card(challenge_id)
 
         await interaction.response.send_message(f"🚨 **REVOKED!** Removed solve for **{challenge_id}** from {member.mention}.\n🔻 Deducted **{deduction} points** (Base: {base_points} + Bonus: {bonus}).", ephemeral=True)
 
@@ -847,17 +919,16 @@ class Admin(commands.Cog):
     @app_commands.command(name="ban_user", description="Ban a user from submitting flags")
     @app_commands.default_permissions(administrator=True)
     async def ban_user(self, interaction: discord.Interaction, member: discord.Member):
-        await self.db.execute("INSERT OR IGNORE INTO banlist (user_id) VALUES (?)", (member.id,))
-        await self.db.commit()
+        await self.bot.writer.execute("INSERT OR IGNORE INTO banlist (user_id) VALUES (?)", (member.id,))
+        self.bot.cache.invalidate("banlist")
         await interaction.response.send_message(f"🚫 **BANNED!** {member.mention} has been disqualified from the CTF.", ephemeral=True)
 
     # --- 10. UNBAN USER ---
     @app_commands.command(name="unban_user", description="Re-enable a user to submit flags")
     @app_commands.default_permissions(administrator=True)
     async def unban_user(self, interaction: discord.Interaction, member: discord.Member):
-        async with self.db.execute("DELETE FROM banlist WHERE user_id = ?", (member.id,)) as cursor:
-            rows = cursor.rowcount
-        await self.db.commit()
+        rows = await self.bot.writer.execute("DELETE FROM banlist WHERE user_id = ?", (member.id,))
+        self.bot.cache.invalidate("banlist")
         
         if rows > 0:
             await interaction.response.send_message(f"✅ **UNBANNED!** {member.mention} can now submit flags again.", ephemeral=True)
@@ -893,7 +964,8 @@ class Admin(commands.Cog):
             return
         
         try:
-            # 1. Close current connection
+            # 1. Flush queued writes, then close current connection
+            await self.bot.writer.close()
             await self.db.close()
             
             # 2. Overwrite the file
@@ -903,16 +975,22 @@ class Admin(commands.Cog):
             self.bot.db = await aiosqlite.connect('bot.db')
             self.bot.db.row_factory = aiosqlite.Row
             await self.bot.db.execute("PRAGMA journal_mode=WAL;")
+            # Backups from older versions are brought up to the current schema
+            await migrate(self.bot.db)
+            self.bot.writer.start()
             
             # Sync self.db and other cogs
             self.db = self.bot.db
             for cog in self.bot.cogs.values():
                 if hasattr(cog, 'db'):
                     cog.db = self.bot.db
+            self.bot.cache.invalidate()
+            await self.bot.ranking.load(self.bot.db)
+            await self.bot.deadlines.load(self.bot.db)
+            await self.cog_load()  # anti-deletion ids of the restored posts
             
             # 4. Force leaderboard refresh
-            cog = self.bot.get_cog('Player')
-            if cog: await cog.update_leaderboard()
+            self.bot.refresh.mark_leaderboard()
 
             await interaction.followup.send("✅ **Database Restored!**\nConnection successfully swapped to the new backup.")
         except Exception as e:
@@ -921,9 +999,53 @@ class Admin(commands.Cog):
                 self.bot.db = await aiosqlite.connect('bot.db')
                 self.bot.db.row_factory = aiosqlite.Row
                 self.db = self.bot.db
+                self.bot.cache.invalidate()
+                self.bot.writer.start()
             except:
                 pass
             await interaction.followup.send(f"❌ Failed to import: {e}")
 
+    # --- 13. RUNTIME METRICS ---
+    @app_commands.command(name="metrics", description="View runtime performance counters")
+    @app_commands.default_permissions(administrator=True)
+    async def metrics(self, interaction: discord.Interaction):
+        gate = self.bot.gate
+        rejected = "\n".join(f"[ {cmd}/{reason} ] {n}" for (cmd, reason), n in sorted(gate.rejected.items())) or "[ none ]"
+        admitted = "\n".join(f"[ {cmd} ] {n}" for cmd, n in sorted(gate.admitted.items())) or "[ none ]"
+
+        writer = self.bot.writer
+        per_commit = writer.jobs / writer.commits if writer.commits else 0
+
+        embed = discord.Embed(title="📈 cyberBOT: RUNTIME METRICS", color=discord.Color.blue())
+        embed.add_field(name="🚦 Admitted", value=f"```ini\n{admitted}\n```", inline=True)
+        embed.add_field(name="⛔ Rejected", value=f"```ini\n{rejected}\n```", inline=True)
+        embed.add_field(name="💾 Group Commit", value=f"```ini\n[ JOBS ] {writer.jobs}\n[ COMMITS ] {writer.commits}\n[ PER COMMIT ] {per_commit:.1f}\n```", inline=False)
+        refresh = self.bot.refresh
+        embed.add_field(name="🖼️ Refreshes", value=f"```ini\n[ MARKED ] {refresh.marks}\n[ RENDERED ] {refresh.renders}\n```", inline=False)
+        logs = self.bot.logs
+        embed.add_field(name="📜 Log Channels", value=f"```ini\n[ EVENTS ] {logs.events}\n[ MESSAGES ] {logs.messages}\n```", inline=False)
+        renderer = self.bot.renderer
+        avg = renderer.render_time / renderer.renders * 1000 if renderer.renders else 0
+        wait = renderer.wait_time / renderer.renders * 1000 if renderer.renders else 0
+        mode = f"{renderer.workers} PROCESSES" if renderer.workers > 0 else "THREADS"
+        embed.add_field(name="🪪 Card Renders", value=f"```ini\n[ MODE ] {mode}\n[ QUEUED ] {renderer.queued}\n[ RENDERS ] {renderer.renders}\n[ AVG ] {avg:.0f} ms (wall {wait:.0f} ms)\n[ SLOWEST ] {renderer.slowest * 1000:.0f} ms\n```", inline=False)
+        encodes = "\n".join(f"[ {enc}{' *' if enc == renderer.encoding else ''} ] {n}x • {secs / n * 1000:.0f} ms • {size / n / 1024:.0f} KB"
+                             for enc, (n, secs, size) in sorted(renderer.encodes.items())) or "[ none ]"
+        embed.add_field(name="🎞️ Card Encoding (avg)", value=f"```ini\n{encodes}\n```", inline=False)
+        cc = self.bot.card_cache
+        embed.add_field(name="🗂️ Card Cache", value=f"```ini\n[ HITS ] {cc.hits}\n[ MISSES ] {cc.misses}\n[ JOINED ] {cc.joined}\n[ CARDS ] {len(cc)} ({cc.size / 1048576:.1f} / {cc.max_bytes / 1048576:.0f} MB)\n[ EVICTED ] {cc.evictions}\n[ PRE-RENDERED ] {self.bot.prerender.warmed} ({self.bot.prerender.cancelled} cycles cancelled)\n```", inline=False)
+        av = self.bot.avatars
+        embed.add_field(name="🧑 Avatars", value=f"```ini\n[ MEMORY HITS ] {av.hits}\n[ DISK HITS ] {av.disk_hits}\n[ FETCHED ] {av.fetches}\n[ CACHED ] {len(av)}\n```", inline=False)
+        handles = self.bot.messages
+        sent = handles.edits + handles.skipped
+        embed.add_field(name="✉️ Message Edits", value=f"```ini\n[ EDITS ] {handles.edits}\n[ SKIPPED ] {handles.skipped} ({handles.skipped / sent * 100 if sent else 0:.0f}% unchanged)\n[ DELETES ] {handles.deletes}\n[ GONE (404) ] {handles.missing}\n[ HANDLES ] {len(handles)}\n[ WATCHED ] {len(self._tracked)}\n[ RESTORED ] {self.restored}\n```", inline=False)
+        deadlines = self.bot.deadlines
+        next_in = deadlines.next_in()
+        embed.add_field(name="⏰ Deadlines", value=f"```ini\n[ POSTS DUE ] {deadlines.pending('post')}\n[ EXPIRIES DUE ] {deadlines.pending('expire')}\n[ FIRED ] {deadlines.fired}\n[ LAST WAVE ] {f'{self.last_wave[0]} posts / {self.last_wave[1]} channels in {self.last_wave[2]:.1f}s' if self.last_wave else 'none'}\n[ NEXT ] {f'in {max(next_in, 0):.0f}s' if next_in is not None else 'none'}\n```", inline=False)
+        guard = self.bot.guard
+        embed.add_field(name="🔒 Brute Force", value=f"```ini\n[ WRONG FLAGS ] {guard.recorded}\n[ LOCKOUTS ] {guard.lockouts}\n[ WINDOWS ] {len(guard)}\n```", inline=False)
+        embed.set_footer(text=f"{len(gate)} active rate-limit buckets")
+        await interaction.response.send_message(embed=embed, ephemeral=True)
+
 async def setup(bot):
     await bot.add_cog(Admin(bot))
@@ -4,54 +4,11 @@ from discord.ext import commands, tasks
 import aiosqlite
 import os
 import time
-import functools
-from PIL import Image, ImageDraw, ImageFont, ImageOps
-from io import BytesIO
 from main import BONUSES
-
-# --- CONFIGURATION & CONSTANTS ---
-# Submission cooldown tracker: user_id -> timestamp of last attempt
-# Pruned on each access to prevent unbounded growth
-_COOLDOWN_TTL = 5  # seconds; prune entries older than this
-COOLDOWNS: dict[int, float] = {}
-
-def _check_and_set_cooldown(user_id: int, window: float = 2.0) -> bool:
-    """Returns True if the user is on cooldown. Always prunes stale entries."""
-    now = time.time()
-    # Prune all entries older than TTL so dict never grows unbounded
-    stale = [uid for uid, ts in COOLDOWNS.items() if now - ts > _COOLDOWN_TTL]
-    for uid in stale:
-        del COOLDOWNS[uid]
-    if user_id in COOLDOWNS and now - COOLDOWNS[user_id] < window:
-        return True
-    COOLDOWNS[user_id] = now
-    return False
-
-# Per-command cooldown store for slash commands (user_id -> last use timestamp)
-_CMD_COOLDOWNS: dict[str, dict[int, float]] = {}
-_CMD_WINDOW = 30  # seconds between user invocations of the same command
-
-def _is_on_cmd_cooldown(cmd: str, user_id: int) -> float | None:
-    """Returns remaining seconds if on cooldown, else None. Auto-prunes."""
-    now = time.time()
-    bucket = _CMD_COOLDOWNS.setdefault(cmd, {})
-    stale = [uid for uid, ts in bucket.items() if now - ts > _CMD_WINDOW]
-    for uid in stale:
-        del bucket[uid]
-    last = bucket.get(user_id)
-    if last and now - last < _CMD_WINDOW:
-        return round(_CMD_WINDOW - (now - last), 1)
-    bucket[user_id] = now
-    return None
-
-async def get_config_id(db, key):
-    """Helper to fetch channel/role IDs from the persistent database."""
-    try:
-        async with db.execute("SELECT value FROM config WHERE key = ?", (key,)) as cursor:
-            result = await cursor.fetchone()
-            return result[0] if result else None
-    except Exception:
-        return None
+from core.ledger import record_solve
+from io import BytesIO
+from core.cards import ENCODINGS
+from core.posts import load_post, is_expired
 
 # --- SOLVERS LIST PAGINATION VIEW ---
 class SolversView(discord.ui.View):
@@ -64,6 +21,7 @@ class SolversView(discord.ui.View):
         self.page = page
     
     async def get_solvers_data(self):
+        # Covered by idx_solves_challenge_ts
         async with self.db.execute("SELECT user_id FROM solves WHERE challenge_id = ? ORDER BY timestamp ASC", (self.challenge_id,)) as cursor:
             return await cursor.fetchall()
     
@@ -177,16 +135,18 @@ class HintSelect(discord.ui.Select):
             await interaction.response.send_message(f"❌ You need {cost} pts (Balance: {current_points})", ephemeral=True)
             return
 
+        async def purchase(db):
+            await db.execute("INSERT INTO unlocked_hints (user_id, hint_id) VALUES (?, ?)", (self.user_id, hint_id))
+            await db.execute("UPDATE scores SET points = points - ? WHERE user_id = ?", (cost, self.user_id))
+
         try:
-            await self.db.execute("INSERT INTO unlocked_hints (user_id, hint_id) VALUES (?, ?)", (self.user_id, hint_id))
-            await self.db.execute("UPDATE scores SET points = points - ? WHERE user_id = ?", (cost, self.user_id))
-            await self.db.commit()
+            await self.bot.writer.run(purchase)
         except aiosqlite.IntegrityError:
             await interaction.response.send_message("⚠️ You already unlocked this hint!", ephemeral=True)
             return
 
-        cog = self.bot.get_cog('Player')
-        if cog: await cog.update_leaderboard()
+        await self.bot.ranking.refresh(self.db, [self.user_id])
+        self.bot.refresh.mark_leaderboard()
         
         await interaction.response.send_message(f"✅ **Purchased!** (-{cost} pts)\n🔓 **Hint:** ||{text}||", ephemeral=True)
 
@@ -210,27 +170,32 @@ class SubmissionModal(discord.ui.Modal, title="cyberBOT: Flag Submission"):
         user_id = interaction.user.id
         current_time = time.time()
 
+        cache = self.bot.cache
+
         # 0. Check Banlist
-        async with self.db.execute("SELECT * FROM banlist WHERE user_id = ?", (user_id,)) as cursor:
-            if await cursor.fetchone():
-                await interaction.response.send_message("🚫 **ACCESS DENIED.** You have been disqualified.", ephemeral=True)
-                return
+        if await cache.is_banned(user_id):
+            self.bot.gate.reject("submit", "banned")
+            await interaction.response.send_message("🚫 **ACCESS DENIED.** You have been disqualified.", ephemeral=True)
+            return
+
+        # 0.05 Brute-force lockout
+        locked = self.bot.guard.locked_for(user_id, current_time)
+        if locked:
+            self.bot.gate.reject("submit", "lockout")
+            await interaction.response.send_message(f"🔒 **Terminal locked.** Too many wrong flags. Try again in {locked:.0f}s.", ephemeral=True)
+            return
 
         # 0.1 Check Time Limit
-        async with self.db.execute("SELECT end_time FROM flags WHERE challenge_id = ?", (self.challenge_id,)) as cursor:
-            data = await cursor.fetchone()
-            if data and data[0] and int(current_time) > data[0]:
-                await interaction.response.send_message("⏳ **Time limit exceeded.** Challenge closed.", ephemeral=True)
-                return
+        challenge = await cache.flag(self.challenge_id)
+        if challenge and challenge['end_time'] and int(current_time) > challenge['end_time']:
+            await interaction.response.send_message("⏳ **Time limit exceeded.** Challenge closed.", ephemeral=True)
+            return
 
-        # 1. Cooldown Check (skipped for admins)
+        # 1. Rate Limit Check: per agent and per (agent, mission) buckets (skipped for admins)
         if not interaction.user.guild_permissions.administrator:
-            if _check_and_set_cooldown(user_id, window=2.0):
+            if self.bot.gate.check("submit", user_id, self.challenge_id):
                 await interaction.response.send_message("⏳ Too fast! System cooling down.", ephemeral=True)
                 return
-        else:
-            # Still set the timestamp for non-cooldown users to track last submission
-            COOLDOWNS[user_id] = current_time
 
         # 2. Duplicate Solve Check
         async with self.db.execute("SELECT * FROM solves WHERE user_id = ? AND challenge_id = ?", (user_id, self.challenge_id)) as cursor:
@@ -238,102 +203,75 @@ class SubmissionModal(discord.ui.Modal, title="cyberBOT: Flag Submission"):
                 await interaction.response.send_message("⚠️ Protocol error: Challenge already solved.", ephemeral=True)
                 return
 
-        async with self.db.execute("SELECT flag_text, points FROM flags WHERE challenge_id = ?", (self.challenge_id,)) as cursor:
-            result = await cursor.fetchone()
-
-        if not result:
+        if not challenge:
             await interaction.response.send_message("❌ Error: Mission ID not found.", ephemeral=True)
             return
 
-        correct_flag, base_points = result
+        correct_flag, base_points = challenge['flag_text'], challenge['points']
 
         if user_flag == correct_flag:
-            # COLLUSION CHECK
-            async with self.db.execute("SELECT user_id, timestamp FROM solves WHERE challenge_id = ? ORDER BY timestamp DESC LIMIT 1", (self.challenge_id,)) as cursor:
-                last_solve = await cursor.fetchone()
-            
-            suspicion_msg = None
-            if last_solve:
-                last_solver_id, last_ts = last_solve
-                time_diff = current_time - last_ts
-                if last_solver_id != user_id and time_diff <= 60:
-                    suspicion_msg = f"🚨 **COLLUSION DETECTED**\nSolved **{self.challenge_id}** within **{time_diff:.1f}s** of <@{last_solver_id}>."
-
             try:
-                await self.db.execute("INSERT INTO solves (user_id, challenge_id, timestamp) VALUES (?, ?, ?)", (user_id, self.challenge_id, current_time))
-                async with self.db.execute("SELECT COUNT(*) FROM solves WHERE challenge_id = ?", (self.challenge_id,)) as cursor:
-                    res = await cursor.fetchone()
-                    solve_index = res[0] - 1 
-                
-                bonus = BONUSES.get(solve_index, 0)
-                total_points = base_points + bonus
-
-                await self.db.execute("INSERT OR IGNORE INTO scores (user_id, username, points) VALUES (?, ?, 0)", (user_id, interaction.user.name))
-                await self.db.execute("UPDATE scores SET points = points + ? WHERE user_id = ?", (total_points, user_id))
-                
-                async with self.db.execute("SELECT points FROM scores WHERE user_id = ?", (user_id,)) as cursor:
-                    res = await cursor.fetchone()
-                    new_total_score = res[0]
+                # Solve, ordinal, score credit and new total in one transaction
+                receipt = await record_solve(self.bot.writer, user_id, interaction.user.name, self.challenge_id, base_points, BONUSES)
+                bonus, total_points, new_total_score = receipt.bonus, receipt.awarded, receipt.new_total
+                self.bot.ranking.update(user_id, new_total_score, receipt.timestamp, interaction.user.name)
+
+                # COLLUSION CHECK
+                suspicion_msg = None
+                if receipt.prev_solver is not None:
+                    time_diff = receipt.timestamp - receipt.prev_ts
+                    if time_diff <= 60:
+                        suspicion_msg = f"🚨 **COLLUSION DETECTED**\nSolved **{self.challenge_id}** within **{time_diff:.1f}s** of <@{receipt.prev_solver}>."
                 
-                # ROLE UPDATES
-                role_msg = ""
-                if interaction.guild:
-                    member = interaction.guild.get_member(user_id)
-                    if member:
-                        rank_map = {}
-                        async with self.db.execute("SELECT role_id, points FROM role_rewards") as cursor:
-                            async for row in cursor: rank_map[row[1]] = row[0]
-
-                        assigned_roles = []
-                        for threshold, role_id in rank_map.items():
-                            if new_total_score >= threshold:
-                                role = interaction.guild.get_role(role_id)
-                                if role and role not in member.roles:
-                                    try:
-                                        await member.add_roles(role)
-                                        assigned_roles.append(role.name)
-                                    except Exception:
-                                        pass
-                        if assigned_roles:
-                            role_msg = f"\n🆙 **Promoted!** New clearance: {', '.join(assigned_roles)}"
-
-                await self.db.commit()
-
                 msg = f"🎉 **Correct!** +{total_points} pts"
                 if bonus > 0: msg += f" (First Blood: +{bonus}!)"
-                msg += role_msg
                 await interaction.response.send_message(msg, ephemeral=True)
 
-                # LOGGING SUCCESSFUL SUBMISSION
-                log_channel_id = await get_config_id(self.db, "channel_challenge_logs")
-                if log_channel_id:
-                    log_channel = self.bot.get_channel(int(log_channel_id))
-                    if log_channel:
-                        desc = f"**User:** {interaction.user.mention}\n**Challenge:** {self.challenge_id}\n**Points:** {total_points}"
-                        color = discord.Color.green()
-                        if suspicion_msg:
-                            desc += f"\n\n{suspicion_msg}"
-                            color = discord.Color.orange()
-                        embed = discord.Embed(title="✅ Flag Captured", description=desc, color=color)
-                        await log_channel.send(embed=embed)
+                # ROLE UPDATES: applied off the response path; the worker follows up if promoted
+                self.bot.promotions.submit(interaction.guild, user_id, new_total_score, interaction)
+
+                # LOGGING SUCCESSFUL SUBMISSION (buffered; flushed in batches by the log aggregator)
+                desc = f"**User:** {interaction.user.mention}\n**Challenge:** {self.challenge_id}\n**Points:** {total_points}"
+                summary = f"✅ {interaction.user.mention} • **{self.challenge_id}** • +{total_points}"
+                color = discord.Color.green()
+                if suspicion_msg:
+                    desc += f"\n\n{suspicion_msg}"
+                    summary += f" • 🚨 collusion with <@{receipt.prev_solver}>"
+                    color = discord.Color.orange()
+                embed = discord.Embed(title="✅ Flag Captured", description=desc, color=color)
+                self.bot.logs.emit("channel_challenge_logs", embed, summary)
                 
-                cog = self.bot.get_cog('Player')
-                if cog: 
-                    await cog.update_leaderboard()
-                    await cog.update_challenge_card(self.challenge_id)
+                # Coalesced re-render; never blocks the submission
+                self.bot.refresh.mark_leaderboard()
+                self.bot.refresh.mark_card(self.challenge_id)
+                self.bot.prerender.mark(interaction.guild, user_id)
             except aiosqlite.IntegrityError:
                 await interaction.response.send_message("⚠️ Duplicate solve detected.", ephemeral=True)
         else:
-            await interaction.response.send_message("❌ **Wrong Flag!** Access denied.", ephemeral=True)
-
-            # LOGGING FAILED SUBMISSION
-            wrong_log_id = await get_config_id(self.db, "channel_wrong_submissions")
-            if wrong_log_id:
-                wrong_channel = self.bot.get_channel(int(wrong_log_id))
-                if wrong_channel:
-                    desc = f"**User:** {interaction.user.mention}\n**Challenge:** {self.challenge_id}\n**Input:** `{user_flag}`"
-                    embed = discord.Embed(title="❌ Wrong Flag Submission", description=desc, color=discord.Color.red())
-                    await wrong_channel.send(embed=embed)
+            # Append-only attempt log, committed with the next write batch
+            self.bot.writer.defer("INSERT INTO wrong_attempts (user_id, challenge_id, flag, timestamp) VALUES (?, ?, ?, ?)",
+                                  (user_id, self.challenge_id, user_flag, current_time))
+            lockout = None
+            if not interaction.user.guild_permissions.administrator:
+                lockout = self.bot.guard.record_wrong(user_id, self.challenge_id, current_time)
+
+            msg = "❌ **Wrong Flag!** Access denied."
+            if lockout:
+                msg += f"\n🔒 Too many wrong flags. Submissions locked for **{lockout[0]:.0f}s**."
+            await interaction.response.send_message(msg, ephemeral=True)
+
+            # LOGGING FAILED SUBMISSION (buffered)
+            desc = f"**User:** {interaction.user.mention}\n**Challenge:** {self.challenge_id}\n**Input:** `{user_flag}`"
+            embed = discord.Embed(title="❌ Wrong Flag Submission", description=desc, color=discord.Color.red())
+            self.bot.logs.emit("channel_wrong_submissions", embed, f"❌ {interaction.user.mention} • **{self.challenge_id}** • `{user_flag[:60]}`")
+
+            # ADMIN ALERT
+            if lockout:
+                duration, window, strike = lockout
+                scope = f"on **{self.challenge_id}**" if window == "challenge" else "across missions"
+                desc = f"**User:** {interaction.user.mention}\n**Trigger:** wrong-flag burst {scope}\n**Lockout:** {duration:.0f}s (strike {strike})"
+                embed = discord.Embed(title="🚨 Brute-Force Lockout", description=desc, color=discord.Color.orange())
+                self.bot.logs.emit("channel_challenge_logs", embed, f"🚨 {interaction.user.mention} locked {duration:.0f}s • brute force {scope} • strike {strike}")
 
 # --- LEADERBOARD PAGINATION VIEW ---
 class LeaderboardView(discord.ui.View):
@@ -342,30 +280,18 @@ class LeaderboardView(discord.ui.View):
         self.bot = bot
         self.db = db
         self.page = page
+        # Pages come from the standings as they were when this view opened
+        self.snapshot = bot.ranking.snapshot()
 
     async def create_embed(self):
-        # MILLISECOND TIE-BREAKING: ORDER BY points DESC, then achievement time ASC (NULLS LAST)
-        async with self.db.execute("""
-            SELECT s.user_id, s.username, s.points 
-            FROM scores s
-            LEFT JOIN (
-                SELECT user_id, MAX(timestamp) as last_ts 
-                FROM solves 
-                GROUP BY user_id
-            ) t ON s.user_id = t.user_id
-            ORDER BY s.points DESC, (t.last_ts IS NULL) ASC, t.last_ts ASC
-        """) as cursor:
-            all_players = await cursor.fetchall()
-
-        per_page = 10
-        total_players = len(all_players)
-        total_pages = max(1, (total_players + per_page - 1) // per_page)
+        # MILLISECOND TIE-BREAKING: the rank index orders by points DESC, then achievement time ASC (NULLS LAST)
+        snapshot = self.snapshot
+        total_pages = snapshot.pages
         self.page = max(0, min(self.page, total_pages - 1))
-        
-        start_idx = self.page * per_page
-        page_players = all_players[start_idx : start_idx + per_page]
+        page_players = snapshot.page(self.page)
 
         embed = discord.Embed(title="🏆 cyberBOT GLOBAL STANDINGS", color=0xFFD700)
+        # The generation stays on self.snapshot: in the embed it would change the payload on every score change
         embed.set_footer(text=f"Page {self.page + 1}/{total_pages} • Refreshes periodically")
 
         desc = ""
@@ -377,8 +303,7 @@ class LeaderboardView(discord.ui.View):
             except (ValueError, TypeError):
                 pass
 
-        for i, (uid, db_username, points) in enumerate(page_players, 1):
-            actual_rank = start_idx + i
+        for actual_rank, uid, db_username, points in page_players:
             member = guild.get_member(uid) if guild else None
             final_name = member.display_name if member else db_username
             
@@ -396,19 +321,22 @@ class LeaderboardView(discord.ui.View):
         self.children[0].disabled = (self.page == 0)
         self.children[1].disabled = (self.page >= total_pages - 1)
 
-    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.gray)
-    async def prev(self, interaction: discord.Interaction, button: discord.ui.Button):
-        self.page -= 1
+    async def turn_page(self, interaction: discord.Interaction, step):
+        self.page += step
         embed, total_pages = await self.create_embed()
         self.update_buttons(total_pages)
         await interaction.response.edit_message(embed=embed, view=self)
+        # The public board is paged in place: record what it shows now, or the next
+        # refresh back to page 1 would match the old payload and be skipped
+        if interaction.message: self.bot.messages.remember(interaction.message.id, embed, self)
+
+    @discord.ui.button(label="◀ Previous", style=discord.ButtonStyle.gray)
+    async def prev(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self.turn_page(interaction, -1)
 
     @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.gray)
     async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
-        self.page += 1
-        embed, total_pages = await self.create_embed()
-        self.update_buttons(total_pages)
-        await interaction.response.edit_message(embed=embed, view=self)
+        await self.turn_page(interaction, 1)
 
 # --- PLAYER COG ---
 class Player(commands.Cog):
@@ -416,24 +344,13 @@ class Player(commands.Cog):
         self.bot = bot
         self.db = bot.db
         self.leaderboard_refresh.start()
-        
-        try:
-            # Scaled fonts for 1800x700 resolution
-            self.title_font = ImageFont.truetype("font.ttf", 130)
-            self.badge_font = ImageFont.truetype("font.ttf", 60)
-            self.label_font = ImageFont.truetype("font.ttf", 50)
-            self.value_font = ImageFont.truetype("font.ttf", 110)
-            self.small_font = ImageFont.truetype("font.ttf", 35)
-            self.micro_font = ImageFont.truetype("font.ttf", 24)
-        except Exception:
-            self.title_font = self.badge_font = self.label_font = self.value_font = self.small_font = self.micro_font = ImageFont.load_default()
 
     def cog_unload(self):
         self.leaderboard_refresh.cancel()
 
     @tasks.loop(minutes=2)
     async def leaderboard_refresh(self):
-        await self.update_leaderboard()
+        self.bot.refresh.mark_leaderboard()
 
     @leaderboard_refresh.before_loop
     async def before_leaderboard_refresh(self):
@@ -448,252 +365,40 @@ class Player(commands.Cog):
                 await interaction.response.send_modal(SubmissionModal(cid, self.bot))
             elif custom_id.startswith("hints:"):
                 cid = custom_id.split(":")[1]
+                if not interaction.user.guild_permissions.administrator:
+                    remaining = self.bot.gate.check("hints", interaction.user.id)
+                    if remaining:
+                        await interaction.response.send_message(f"⏳ Too fast! Try again in **{remaining}s**.", ephemeral=True)
+                        return
                 async with self.db.execute("SELECT id, hint_text, cost FROM hints WHERE challenge_id = ?", (cid,)) as cursor:
                     hints = await cursor.fetchall()
                 if not hints: await interaction.response.send_message("🤷‍♂️ No hints available for this mission.", ephemeral=True)
                 else: await interaction.response.send_message(view=HintView(hints, self.bot, interaction.user.id), ephemeral=True)
             elif custom_id.startswith("solvers:"):
                 cid = custom_id.split(":")[1]
-                async with self.db.execute("SELECT points FROM flags WHERE challenge_id = ?", (cid,)) as cursor:
-                    res = await cursor.fetchone()
-                if not res: return
-                view = SolversView(cid, interaction.guild, res[0], self.db)
+                challenge = await self.bot.cache.flag(cid)
+                if not challenge: return
+                view = SolversView(cid, interaction.guild, challenge['points'], self.db)
                 solvers = await view.get_solvers_data()
                 embed = await view.create_embed(solvers)
                 view.update_buttons(max(1, (len(solvers) + 9) // 10))
                 await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
-    def draw_profile_card(self, user, rank, points, solves, avatar_bytes, next_goal=None, last_cats=None, earned_role="RECRUIT"):
-        width, height = 1800, 700
-        # Default Charcoal
-        bg_color = (20, 22, 25)  
-        if points == 999999:
-            # Deep Imperial Navy for the bot's background
-            bg_color = (0, 10, 30)
-
-        try:
-            rank_num = int(rank.replace("#", ""))
-        except:
-            rank_num = 999 
-
-        primary = (0, 255, 230); fill_color = (0, 40, 40); b_text = (200, 255, 255); role = "OPERATIVE"
-        # --- BOT OVERRIDE COLORS ---
-        if points == 999999:
-            # Royal Emerald & Jade Tech theme
-            primary = (0, 255, 120); fill_color = (0, 40, 20); b_text = (150, 255, 200); role = "SYSTEM CORE"
-        elif rank_num == 1: primary = (255, 215, 0); fill_color = (40, 30, 0); b_text = (255, 230, 150); role = "CHAMPION"
-        elif rank_num == 2: primary = (229, 228, 226); fill_color = (45, 45, 50); b_text = (255, 255, 255); role = "VANGUARD"
-        elif rank_num == 3: primary = (205, 127, 50); fill_color = (40, 20, 10); b_text = (255, 200, 180); role = "CHALLENGER"
-        elif 4 <= rank_num <= 10: primary = (220, 20, 60); fill_color = (50, 10, 15); b_text = (255, 200, 200); role = "SENTINEL"
-        elif points == 0: primary = (100, 100, 100); fill_color = (30, 30, 35); b_text = (200, 200, 200); role = "RECRUIT"
-
-        with Image.new("RGBA", (width, height), bg_color) as card:
-            draw = ImageDraw.Draw(card)
-            
-            # --- DIGITAL GRID BACKGROUND ---
-            for x in range(0, width, 80): draw.line([(x, 0), (x, height)], fill=(30, 35, 40), width=2)
-            for y in range(0, height, 80): draw.line([(0, y), (width, y)], fill=(30, 35, 40), width=2)
-
-            # --- NEON GLOW EDGES ---
-            glow_color = primary + (50,)
-            for i in range(1, 4):
-                gw = 6 + (i * 4)
-                draw.rectangle([0, 0, width, height], outline=glow_color, width=gw)
-                # Avatar border glow centered between metadata and clearance box
-                draw.ellipse((100-i, 135-i, 500+i, 535+i), outline=glow_color, width=gw)
-
-            # --- DOSSIER STAMP ---
-            try:
-                # Reduced size to 220 to stay inside boundaries
-                stamp_font = ImageFont.truetype("font.ttf", 220)
-                stamp_txt = "CLASSIFIED"
-                stamp_img = Image.new("RGBA", (1300, 400), (0,0,0,0))
-                s_draw = ImageDraw.Draw(stamp_img)
-                # Brighter fill and much lighter outline for high contrast
-                s_draw.text((10, 10), stamp_txt, fill=(255, 40, 40, 45), font=stamp_font, stroke_width=2, stroke_fill=(255, 160, 160, 60))
-                # Slight rotation (10 deg) to ensure it fits vertically
-                rotated_stamp = stamp_img.rotate(10, expand=1, resample=Image.Resampling.BICUBIC)
-                # Centered paste
-                card.paste(rotated_stamp, (400, 180), rotated_stamp)
-            except: pass
-
-            # --- STAPLES (Top Left) ---
-            draw.line([(40, 30), (40, 110)], fill=(100, 105, 110), width=12)
-            draw.line([(70, 30), (70, 110)], fill=(100, 105, 110), width=12)
-
-            # --- METADATA (Top Left - Under Staples) ---
-            draw.text((110, 35), f"ID_REF: {user.id}", fill=(primary[0], primary[1], primary[2], 120), font=self.micro_font)
-            draw.text((110, 65), "STATUS: ACTIVE_OPERATIVE", fill=primary, font=self.micro_font)
-
-            # --- CORNER ACCENTS ---
-            blen, bw = 200, 12
-            draw.line([(0, 0), (blen, 0)], fill=primary, width=bw); draw.line([(0, 0), (0, blen)], fill=primary, width=bw)
-            draw.line([(width, height), (width-blen, height)], fill=primary, width=bw); draw.line([(width, height), (width, height-blen)], fill=primary, width=bw)
-
-            ax, ay, asz = 100, 135, 400
-            if avatar_bytes:
-                try:
-                    with BytesIO(avatar_bytes) as av_buf:
-                        with Image.open(av_buf) as av_raw:
-                            av_raw.thumbnail((asz, asz), Image.Resampling.LANCZOS) 
-                            with av_raw.convert("RGBA") as avatar:
-                                with Image.new("L", avatar.size, 0) as mask:
-                                    ImageDraw.Draw(mask).ellipse((0, 0, avatar.size[0], avatar.size[1]), fill=255)
-                                    with ImageOps.fit(avatar, mask.size, centering=(0.5, 0.5)) as output:
-                                        output.putalpha(mask); card.paste(output, (ax, ay), output)
-                except Exception: avatar_bytes = None # Trigger fallback if image processing fails
-            
-            if not avatar_bytes:
-                # --- INITIALS FALLBACK ---
-                initial = user.display_name[0].upper() if user.display_name else "?"
-                # Draw solid background for the initial
-                draw.ellipse((ax, ay, ax+asz, ay+asz), fill=fill_color, outline=primary, width=4)
-                # Use a massive font for the initial
-                try:
-                    initial_font = ImageFont.truetype("font.ttf", 250)
-                except:
-                    initial_font = self.title_font
-                
-                # Center the initial text
-                i_bbox = draw.textbbox((0, 0), initial, font=initial_font)
-                i_w = i_bbox[2] - i_bbox[0]
-                i_h = i_bbox[3] - i_bbox[1]
-                draw.text((ax + (asz - i_w)//2, ay + (asz - i_h)//2 - 30), initial, fill=primary, font=initial_font)
-            
-            # Inner circle border (Always drawn for sharpness)
-            draw.ellipse((ax, ay, ax+asz, ay+asz), outline=primary, width=4)
-            # Name shifted up from 80 to 50
-            draw.text((600, 50), user.display_name.upper(), fill="white", font=self.title_font)
-            
-            # --- CLEARANCE ROLE BOX (Bottom Left) ---
-            cr_x, cr_y, cr_w, cr_h = 100, 580, 400, 70
-            cr_poly = [(cr_x+10, cr_y), (cr_x+cr_w-10, cr_y), (cr_x+cr_w, cr_y+10), (cr_x+cr_w, cr_y+cr_h-10), (cr_x+cr_w-10, cr_y+cr_h), (cr_x+10, cr_y+cr_h), (cr_x, cr_y+cr_h-10), (cr_x, cr_y+10)]
-            draw.polygon(cr_poly, fill=fill_color, outline=primary, width=3)
-            # Center the role text
-            cr_bbox = draw.textbbox((0,0), earned_role, font=self.small_font)
-            cr_tw = cr_bbox[2]-cr_bbox[0]
-            cr_th = cr_bbox[3]-cr_bbox[1]
-            draw.text((cr_x+(cr_w-cr_tw)//2, cr_y+(cr_h-cr_th)//2-4), earned_role, fill=primary, font=self.small_font)
-
-            # Badge shifted up from 240 to 180
-            bx, by, bh, cut = 600, 180, 90, 24
-            bw_val = draw.textbbox((0, 0), role, font=self.badge_font)[2] + 140
-            poly = [(bx+cut, by), (bx+bw_val-cut, by), (bx+bw_val, by+cut), (bx+bw_val, by+bh-cut), (bx+bw_val-cut, by+bh), (bx+cut, by+bh), (bx, by+bh-cut), (bx, by+cut)]
-            draw.polygon(poly, fill=fill_color, outline=primary, width=4)
-            ds, dcx, dcy = 20, bx + 50, by + 44
-            draw.polygon([(dcx, dcy-ds), (dcx+ds, dcy), (dcx, dcy+ds), (dcx-ds, dcy)], fill=primary)
-            draw.text((bx+100, by+8), role, fill=b_text, font=self.badge_font)
-
-            # --- PROGRESS BAR ---
-            if next_goal:
-                bar_x, bar_y, bar_w, bar_h = 600, 650, 1100, 20
-                percent = min(1.0, points / next_goal)
-                draw.rectangle([bar_x, bar_y, bar_x+bar_w, bar_y+bar_h], fill=(30, 30, 35)) # Back
-                draw.rectangle([bar_x, bar_y, bar_x+int(bar_w*percent), bar_y+bar_h], fill=primary) # Fill
-                
-                # Labels
-                progress_text = f"CLEARANCE PROGRESS: {int(percent*100)}%"
-                goal_text = f"{next_goal} PTS GOAL"
-                
-                # Get width of goal text to align right
-                goal_w = draw.textbbox((0, 0), goal_text, font=self.small_font)[2]
-                
-                draw.text((bar_x, bar_y-45), progress_text, fill=primary, font=self.small_font)
-                draw.text((bar_x + bar_w - goal_w, bar_y-45), goal_text, fill=primary, font=self.small_font)
-            else:
-                # --- CENTERED MAX CLEARANCE TEXT ---
-                # Horizontally centered under the three boxes (Rank, Score, Flags)
-                # Box start: 600, Box end: 1360+340=1700. Center = 1150
-                m_text = "ARCHITECT OF THE SIMULATION" if points == 999999 else "MAX CLEARANCE LEVEL ATTAINED"
-                m_bbox = draw.textbbox((0, 0), m_text, font=self.label_font)
-                m_w = m_bbox[2] - m_bbox[0]
-                # Center horizontally (1150) and move up slightly from bottom
-                draw.text((1150 - (m_w//2), 580), m_text, fill=primary, font=self.label_font)
-
-            def d_stat(x, y, lab, val):
-                sw, sh, c = 340, 220, 20
-                p = [(x+c, y), (x+sw-c, y), (x+sw, y+c), (x+sw, y+sh-c), (x+sw-c, y+sh), (x+c, y+sh), (x, y+sh-c), (x, y+c)]
-                draw.polygon(p, fill=(20, 25, 30), outline=primary, width=4)
-                draw.text((x+30, y+20), lab, fill=primary, font=self.label_font)
-                
-                display_val = "∞" if points == 999999 and lab in ["RANK", "SCORE"] else str(val)
-                # --- BOT OVERRIDES ---
-                if points == 999999:
-                    if lab == "RANK": display_val = "[ROOT]"
-                    if lab == "FLAGS": display_val = "KERNEL"
-                
-                # Use smaller font for longer words to prevent overflow
-                v_font = self.value_font
-                v_y = y + 90
-                if len(display_val) > 5:
-                    v_font = self.badge_font # Size 60
-                    v_y = y + 115 # Lowered to align with infinity symbols
-                
-                draw.text((x+30, v_y), display_val, fill="white", font=v_font)
-
-            # Stat boxes shifted up from 380 to 310
-            d_stat(600, 310, "RANK", rank); d_stat(980, 310, "SCORE", points); d_stat(1360, 310, "FLAGS", solves)
-            
-            # --- RECENT SPECIALIZATION HUD TAGS (Top Right) ---
-            if last_cats:
-                cat_info = {
-                    "WEB": ("WEB", (0, 255, 230)),
-                    "CRYPTO": ("CRY", (255, 230, 0)),
-                    "PWN": ("PWN", (255, 0, 80)),
-                    "REV": ("REV", (180, 0, 255)),
-                    "FORENSICS": ("FOR", (0, 255, 100)),
-                    "OSINT": ("OSI", (255, 150, 0)),
-                    "MISC": ("MSC", (180, 180, 180))
-                }
-                
-                # Box Specs (Miniature version of main boxes)
-                tw, th, tc = 160, 70, 10
-                curr_x = width - 100 - tw
-                # Moved down from 60 to 190 to align with the Role Badge (CHAMPION box)
-                top_y = 190 
-                
-                for cat in reversed(last_cats):
-                    label, clr = cat_info.get(cat, (cat[:3].upper(), (200, 200, 200)))
-                    
-                    # --- BOT TAG OVERRIDE (RGB) ---
-                    if points == 999999:
-                        if label == "SYS": clr = (255, 50, 50)   # Red
-                        elif label == "SQL": clr = (50, 255, 50) # Green
-                        elif label == "ENC": clr = (50, 100, 255)# Blue
-
-                    # Draw Small Tech Box
-                    tp = [(curr_x+tc, top_y), (curr_x+tw-tc, top_y), (curr_x+tw, top_y+tc), (curr_x+tw, top_y+th-tc), (curr_x+tw-tc, top_y+th), (curr_x+tc, top_y+th), (curr_x, top_y+th-tc), (curr_x, top_y+tc)]
-                    draw.polygon(tp, fill=(20, 25, 30), outline=clr, width=3)
-                    
-                    # Add Glow
-                    glow = clr + (40,)
-                    draw.polygon(tp, outline=glow, width=6)
-                    
-                    # Center the label text
-                    bbox = draw.textbbox((0, 0), label, font=self.small_font)
-                    t_w = bbox[2] - bbox[0]
-                    t_h = bbox[3] - bbox[1]
-                    draw.text((curr_x + (tw - t_w)//2, top_y + (th - t_h)//2 - 4), label, fill=clr, font=self.small_font)
-                    
-                    curr_x -= (tw + 20) # Space for next tag
-
-            buf = BytesIO(); card.save(buf, format="PNG", optimize=True); buf.seek(0); return buf
-
     @app_commands.command(name="help", description="Protocol manual for Agents and Admins")
     async def help(self, interaction: discord.Interaction):
         await interaction.response.defer(ephemeral=True)
 
         # Cooldown: non-admins only
         if not interaction.user.guild_permissions.administrator:
-            remaining = _is_on_cmd_cooldown("help", interaction.user.id)
+            remaining = self.bot.gate.check("help", interaction.user.id)
             if remaining:
                 await interaction.followup.send(f"⏳ Command on cooldown. Try again in **{remaining}s**.", ephemeral=True)
                 return
         
         # --- AGENT COMMANDS ---
         agent_manual = (
-            "🛡️ **`/profile [member]`**\n"
-            "↳ Generates your high-res Agent ID card. Displays current Rank, total Score, and solve count. Mention another member to inspect their stats.\n\n"
+            "🛡️ **`/profile [member] [quality]`**\n"
+            "↳ Generates your high-res Agent ID card. Displays current Rank, total Score, and solve count. Mention another member to inspect their stats. Pick a lighter quality (compact, WebP, preview) for a faster upload.\n\n"
             "🏆 **`/leaderboard`**\n"
             "↳ Opens the global standing interactive menu with ◀ ▶ buttons. Standings are sorted by points and millisecond-accurate solve times.\n\n"
             "🛡️ **`/about`**\n"
@@ -722,7 +427,8 @@ class Player(commands.Cog):
                 "📋 **`/list_rank_roles`**\n↳ Displays all currently configured point requirements and their associated roles.\n\n"
                 "📦 **`/export`**\n↳ Generates and sends a downloadable `bot.db` file for local backup.\n\n"
                 "📥 **`/import [file]`**\n↳ Live-swaps the current database with a backup file. Zero-downtime restoration.\n\n"
-                "🔄 **`/reset_config`**\n↳ Wipes only the channel and role settings, leaving player data intact."
+                "🔄 **`/reset_config`**\n↳ Wipes only the channel and role settings, leaving player data intact.\n\n"
+                "📈 **`/metrics`**\n↳ Shows runtime counters: admitted and rate-limited requests, group-commit batching."
             )
             
             mission_manual = (
@@ -812,59 +518,75 @@ class Player(commands.Cog):
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
     @app_commands.command(name="profile", description="View agent ID card")
-    async def profile(self, interaction: discord.Interaction, member: discord.Member = None):
-        # Cooldown: non-admins only (profile card is CPU-intensive)
+    @app_commands.describe(member="Agent to inspect (defaults to you)", quality="Image format (defaults to the server setting)")
+    @app_commands.choices(quality=[
+        app_commands.Choice(name="Full PNG", value="png"),
+        app_commands.Choice(name="Compact PNG (256 colours)", value="palette"),
+        app_commands.Choice(name="WebP (lossless)", value="webp"),
+        app_commands.Choice(name="WebP (lossy)", value="webp-lossy"),
+        app_commands.Choice(name="Preview (half size)", value="preview")
+    ])
+    async def profile(self, interaction: discord.Interaction, member: discord.Member = None, quality: str = None):
+        # Cooldown: non-admins only (unchanged cards come from the card cache)
         if not interaction.user.guild_permissions.administrator:
-            remaining = _is_on_cmd_cooldown("profile", interaction.user.id)
+            remaining = self.bot.gate.check("profile", interaction.user.id)
             if remaining:
                 await interaction.response.send_message(f"⏳ Command on cooldown. Try again in **{remaining}s**.", ephemeral=True)
                 return
         await interaction.response.defer()
         target = member or interaction.user
-        
+        encoding = quality or self.bot.renderer.encoding
+        data = await self.card_for(target, interaction.guild, encoding)
+        ext = ENCODINGS[encoding][0]
+        await interaction.followup.send(file=discord.File(fp=BytesIO(data), filename=f"profile.{ext}"))
+
+    async def card_for(self, target, guild, encoding=None):
+        """Encoded profile card of target (cached). Also used to pre-render cards in the background."""
+        encoding = encoding or self.bot.renderer.encoding
+
         # --- EASTER EGG: BOT PROFILE ---
         if target.id == self.bot.user.id:
             pts, rank, count, next_goal, cats, earned_role = 999999, "OVERSEER", "KERNEL", None, ["SYS", "SQL", "ENC"], "SYSTEM OVERSEER"
         else:
-            async with self.db.execute("SELECT s.points, t.last_ts FROM scores s LEFT JOIN (SELECT user_id, MAX(timestamp) as last_ts FROM solves GROUP BY user_id) t ON s.user_id = t.user_id WHERE s.user_id = ?", (target.id,)) as cursor:
-                row = await cursor.fetchone()
-            
-            if row:
-                pts, lts = row
-                async with self.db.execute("SELECT COUNT(*) FROM scores s LEFT JOIN (SELECT user_id, MAX(timestamp) as ts FROM solves GROUP BY user_id) t ON s.user_id = t.user_id WHERE s.points > ? OR (s.points = ? AND IFNULL(t.ts, 9999999999) < IFNULL(?, 9999999999))", (pts, pts, lts)) as cursor:
-                    res = await cursor.fetchone(); rank = f"#{res[0] + 1}"
+            entry = self.bot.ranking.get(target.id)
+            if entry:
+                pts = entry[1]; rank = f"#{self.bot.ranking.rank_of(target.id)}"
             else: pts = 0; rank = "N/A"
 
-            async with self.db.execute("SELECT COUNT(*) FROM solves WHERE user_id = ?", (target.id,)) as cursor:
-                count = (await cursor.fetchone())[0]
+            async with self.db.execute("SELECT solve_count FROM scores WHERE user_id = ?", (target.id,)) as cursor:
+                row = await cursor.fetchone()
+                count = row[0] if row else 0
 
             # --- FETCH PROGRESS & CATEGORIES ---
-            async with self.db.execute("SELECT points FROM role_rewards WHERE points > ? ORDER BY points ASC LIMIT 1", (pts,)) as cursor:
-                next_row = await cursor.fetchone()
-                next_goal = next_row[0] if next_row else None
+            thresholds = await self.bot.cache.thresholds()
+            next_goal = thresholds.next_goal(pts)
 
             async with self.db.execute("SELECT f.category FROM solves s JOIN flags f ON s.challenge_id = f.challenge_id WHERE s.user_id = ? ORDER BY s.timestamp DESC LIMIT 3", (target.id,)) as cursor:
                 cats = [r[0] for r in await cursor.fetchall()]
 
             # --- FETCH EARNED ROLE ---
             earned_role = "RECRUIT"
-            async with self.db.execute("SELECT role_id FROM role_rewards WHERE points <= ? ORDER BY points DESC LIMIT 1", (pts,)) as cursor:
-                r_row = await cursor.fetchone()
-                if r_row and interaction.guild:
-                    d_role = interaction.guild.get_role(r_row[0])
-                    if d_role: earned_role = d_role.name.upper()
-
-        av_bytes = await target.avatar.read() if target.avatar else None
-        func = functools.partial(self.draw_profile_card, target, rank, pts, count, av_bytes, next_goal, cats, earned_role)
-        buf = await self.bot.loop.run_in_executor(None, func)
-        await interaction.followup.send(file=discord.File(fp=buf, filename="profile.png"))
-        buf.close()
+            earned_id = thresholds.earned(pts)
+            if earned_id and guild:
+                d_role = guild.get_role(earned_id)
+                if d_role: earned_role = d_role.name.upper()
+
+        # Everything drawn on the card; an unchanged card is served from the cache
+        avatar_key = target.avatar.key if target.avatar else None
+        key = (target.id, target.display_name, avatar_key, rank, pts, count, next_goal, tuple(cats), earned_role, encoding)
+
+        async def render():
+            avatar = await self.bot.avatars.get(target)  # pre-masked circle, cached by avatar hash
+            # Plain values only: the render may run in a worker process
+            return await self.bot.renderer.render(target.id, target.display_name, rank, pts, count, avatar, next_goal, cats, earned_role, encoding)
+
+        return await self.bot.card_cache.get_or_render(key, render)
 
     @app_commands.command(name="leaderboard", description="View global standings")
     async def leaderboard(self, interaction: discord.Interaction):
         # Cooldown: non-admins only
         if not interaction.user.guild_permissions.administrator:
-            remaining = _is_on_cmd_cooldown("leaderboard", interaction.user.id)
+            remaining = self.bot.gate.check("leaderboard", interaction.user.id)
             if remaining:
                 await interaction.response.send_message(f"⏳ Command on cooldown. Try again in **{remaining}s**.", ephemeral=True)
                 return
@@ -874,22 +596,22 @@ class Player(commands.Cog):
         await interaction.response.send_message(embed=embed, view=view, ephemeral=True)
 
     async def update_leaderboard(self):
-        lbc_id = await get_config_id(self.db, 'channel_leaderboard')
+        cache = self.bot.cache
+        lbc_id = await cache.config('channel_leaderboard')
         if not lbc_id: return
         chan = self.bot.get_channel(lbc_id)
         if not chan: return
 
-        async with self.db.execute("SELECT s.user_id FROM scores s LEFT JOIN (SELECT user_id, MAX(timestamp) as lts FROM solves GROUP BY user_id) t ON s.user_id = t.user_id ORDER BY s.points DESC, (t.lts IS NULL) ASC, t.lts ASC LIMIT 1") as cursor:
-            top = await cursor.fetchone()
+        top = self.bot.ranking.champion()
 
-        champ_id = await get_config_id(self.db, 'role_champion')
-        gen_id = await get_config_id(self.db, 'channel_general')
+        champ_id = await cache.config('role_champion')
+        gen_id = await cache.config('channel_general')
         gen_chan = self.bot.get_channel(gen_id) if gen_id else None
 
         if top and champ_id:
             role = chan.guild.get_role(champ_id)
             if role:
-                new_c = chan.guild.get_member(top[0])
+                new_c = chan.guild.get_member(top)
                 if new_c and role not in new_c.roles:
                     old_champs = list(role.members)
                     for old in old_champs: await old.remove_roles(role)
@@ -905,58 +627,38 @@ class Player(commands.Cog):
         view = LeaderboardView(self.bot, self.db, 0)
         embed, total = await view.create_embed()
         view.update_buttons(total)
-        async with self.db.execute("SELECT value FROM config WHERE key = 'lb_msg_id'") as cursor:
-            row = await cursor.fetchone()
+        lb_msg_id = await cache.config('lb_msg_id')
         
-        if row:
+        if lb_msg_id:
             try:
-                msg = await chan.fetch_message(row[0])
-                await msg.edit(embed=embed, view=view)
-            except:
-                row = None
-        if not row:
+                # Repost only when the message is really gone (404)
+                if not await self.bot.messages.edit(chan.id, lb_msg_id, embed=embed, view=view): lb_msg_id = None
+            except discord.HTTPException as e:
+                print(f"⚠️ Leaderboard edit failed: {e}")
+                return
+        if not lb_msg_id:
             msg = await chan.send(embed=embed, view=view)
-            await self.db.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('lb_msg_id', ?)", (msg.id,))
-            await self.db.commit()
+            self.bot.messages.remember(msg.id, embed, view)
+            await self.bot.writer.execute("INSERT OR REPLACE INTO config (key, value) VALUES ('lb_msg_id', ?)", (msg.id,))
+            cache.invalidate("config")
 
     async def update_challenge_card(self, cid):
-        async with self.db.execute("SELECT * FROM flags WHERE challenge_id = ?", (cid,)) as cursor:
-            d = await cursor.fetchone()
-        if not d or not d['msg_id']: return
-        
-        async with self.db.execute("SELECT user_id FROM solves WHERE challenge_id = ? ORDER BY timestamp ASC", (cid,)) as cursor:
-            solves = await cursor.fetchall()
-        async with self.db.execute("SELECT COUNT(*) FROM hints WHERE challenge_id = ?", (cid,)) as cursor:
-            h_count = (await cursor.fetchone())[0]
+        """Re-renders a live challenge post. True if it was edited (or already up to date)."""
+        d = await self.bot.cache.flag(cid)
+        if not d or not d['msg_id']: return False
 
         try:
             chan = self.bot.get_channel(d['channel_id'])
-            msg = await chan.fetch_message(d['msg_id'])
-            desc = f"**Objective:**\n```text\n{d['description'] or 'Solve it.'}\n```"
-            if d['connection_info']: desc += f"\n**📡 Connection:**\n```text\n{d['connection_info']}\n```"
-            
-            emb = discord.Embed(title=f"🛡️ MISSION: {cid}", description=desc, color=discord.Color.red())
-            emb.add_field(name="💰 Bounty", value=f"**{d['points']} Pts**", inline=True)
-            emb.add_field(name="📂 Category", value=f"**{d['category']}**", inline=True)
-            if d['end_time'] and int(time.time()) >= d['end_time']: emb.add_field(name="⏳ Time Left", value="**🔴 Expired**", inline=True)
-            elif d['end_time']: emb.add_field(name="⏳ Time Left", value=f"<t:{d['end_time']}:R>", inline=True)
-            
-            fb = "*Waiting...*"
-            if solves:
-                u = chan.guild.get_member(solves[0][0])
-                fb = f"🥇 **{u.display_name if u else 'Agent'}** (+{d['points'] + BONUSES.get(0, 0)})"
-            emb.add_field(name="🩸 First Blood", value=fb, inline=False)
-            if d['image_url']: emb.set_image(url=d['image_url'])
-
-            view = discord.ui.View(timeout=None)
-            btn = discord.ui.Button(label="Submit Flag", style=discord.ButtonStyle.green, emoji="🚩", custom_id=f"submit:{cid}")
-            if d['end_time'] and int(time.time()) >= d['end_time']: btn.disabled = True; btn.style = discord.ButtonStyle.danger; btn.label = "Closed"
-            view.add_item(btn)
-            if h_count: view.add_item(discord.ui.Button(label="Hints", style=discord.ButtonStyle.gray, emoji="💡", custom_id=f"hints:{cid}"))
-            if solves: view.add_item(discord.ui.Button(label="Solvers", style=discord.ButtonStyle.blurple, emoji="👥", custom_id=f"solvers:{cid}"))
-            await msg.edit(embed=emb, view=view)
-        except Exception:
-            pass
+            emb, view = await load_post(self.db, d, chan.guild if chan else None, BONUSES.get(0, 0))
+            if await self.bot.messages.edit(d['channel_id'], d['msg_id'], embed=emb, view=view): return True
+        except Exception as e:
+            print(f"⚠️ Could not update card for {cid}: {e}")
+            return False
+
+        # 404: the post was deleted. Live challenges are restored; expired ones stay gone.
+        admin = self.bot.get_cog('Admin')
+        if admin and not is_expired(d): await admin.repost(cid)
+        return False
 
 async def setup(bot):
     await bot.add_cog(Player(bot))
@@ -0,0 +1 @@
+# Shared runtime subsystems used by main.py and the cogs.
@@ -0,0 +1,83 @@
+import asyncio
+import os
+import time
+
+import discord
+
+from core.cards import prepare_avatar
+from core.cardcache import CardCache
+
+# --- AVATAR CACHE ---
+# /profile used to download the full-resolution avatar and thumbnail + mask it on every
+# call. Avatars are now fetched once at a size just above the card's 400px circle, masked
+# once, and kept by avatar hash (a new avatar is a new hash) in memory and under
+# AVATAR_CACHE_DIR, so repeat cards cost neither a download nor image processing.
+
+FETCH_SIZE = 512          # smallest CDN size >= the 400px circle
+DISK_TTL = 30 * 86400     # files unused for this long are pruned at startup
+
+
+def _read(path):
+    try:
+        with open(path, 'rb') as f: png = f.read()
+        os.utime(path)  # last use, for pruning
+        return png
+    except OSError:
+        return None
+
+
+def _write(path, png):
+    tmp = path + ".tmp"
+    with open(tmp, 'wb') as f: f.write(png)
+    os.replace(tmp, path)
+
+
+class AvatarCache:
+    """Masked avatar circles (RGBA PNG bytes) by avatar hash, in memory and on disk."""
+
+    def __init__(self, directory=None, max_bytes=None):
+        self.directory = directory or os.getenv('AVATAR_CACHE_DIR') or 'avatars'
+        self._memory = CardCache(max_bytes or int(float(os.getenv('AVATAR_CACHE_MB') or 16) * 1024 * 1024))
+        self.disk_hits = 0
+        self.fetches = 0
+
+    @property
+    def hits(self):
+        return self._memory.hits + self._memory.joined
+
+    def start(self):
+        os.makedirs(self.directory, exist_ok=True)
+        cutoff = time.time() - DISK_TTL
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff: os.remove(path)
+            except OSError: pass
+
+    async def get(self, user):
+        """The prepared circle for user's current avatar, or None (no avatar / fetch failed)."""
+        asset = user.avatar
+        if not asset: return None
+        return await self._memory.get_or_render(asset.key, lambda: self._load(asset))
+
+    async def _load(self, asset):
+        loop = asyncio.get_running_loop()
+        path = os.path.join(self.directory, f"{asset.key}.png")
+        png = await loop.run_in_executor(None, _read, path)
+        if png:
+            self.disk_hits += 1
+            return png
+
+        try:
+            raw = await asset.with_size(FETCH_SIZE).with_static_format("png").read()
+        except discord.DiscordException:
+            return None
+        self.fetches += 1
+        png = await loop.run_in_executor(None, prepare_avatar, raw)
+        if png:
+            try: await loop.run_in_executor(None, _write, path, png)
+            except OSError as e: print(f"⚠️ Could not store avatar {asset.key}: {e}")
+        return png
+
+    def __len__(self):
+        return len(self._memory)
@@ -0,0 +1,98 @@
+import os
+import time
+from collections import deque, OrderedDict
+
+# --- BRUTE-FORCE GUARD ---
+# Sliding-window counters of wrong flags per (user, challenge) and per user. Each window is
+# a deque of timestamps trimmed from the left, and keys live in an OrderedDict in order of
+# last use so idle ones are dropped from the front: every submission costs amortised O(1),
+# even in a guessing storm. Crossing a window locks the user out; repeat offenders get
+# doubled lockouts (capped), and strikes are forgotten after a clean STRIKE_DECAY period.
+
+# window -> (wrong flags allowed, seconds)
+WINDOWS = {
+    "challenge": (10, 60.0),   # 10 wrong guesses on one mission within a minute
+    "user": (30, 300.0),       # 30 wrong guesses across missions within 5 minutes
+}
+LOCKOUT_BASE = 60.0            # first lockout; doubles with each strike
+LOCKOUT_MAX = 3600.0
+STRIKE_DECAY = 6 * 3600.0
+
+
+def _window_from_env(name, default):
+    """BRUTEFORCE_<WINDOW>=count:seconds overrides, e.g. BRUTEFORCE_CHALLENGE=8:60."""
+    raw = os.getenv("BRUTEFORCE_" + name.upper())
+    if not raw: return default
+    try:
+        count, period = raw.split(":")
+        return int(count), float(period)
+    except ValueError:
+        print(f"⚠️ Ignoring malformed brute-force window for {name}: '{raw}'")
+        return default
+
+
+class BruteForceGuard:
+    """Tracks wrong submissions and hands out escalating lockouts."""
+
+    def __init__(self, windows=None, base=None, cap=LOCKOUT_MAX):
+        windows = windows or WINDOWS
+        self.windows = {name: _window_from_env(name, limit) for name, limit in windows.items()}
+        self.base = base or float(os.getenv('BRUTEFORCE_LOCKOUT') or LOCKOUT_BASE)
+        self.cap = cap
+        self._hits: OrderedDict[tuple, deque] = OrderedDict()  # (window, key) -> timestamps
+        self._locked: dict[int, float] = {}                     # user_id -> locked until
+        self._strikes: dict[int, list] = {}                     # user_id -> [strikes, last strike ts]
+        self.recorded = 0
+        self.lockouts = 0
+
+    def locked_for(self, user_id, now=None) -> float:
+        """Seconds left on the user's lockout (0 when free to submit)."""
+        until = self._locked.get(user_id)
+        if until is None: return 0.0
+        remaining = until - (now or time.time())
+        if remaining <= 0:
+            del self._locked[user_id]
+            return 0.0
+        return remaining
+
+    def record_wrong(self, user_id, challenge_id, now=None):
+        """Counts a wrong flag. Returns (lockout seconds, window name, strike) when it trips a lockout, else None."""
+        now = now or time.time()
+        self.recorded += 1
+        self._expire(now)
+
+        tripped = None
+        for name, key in (("challenge", (user_id, challenge_id)), ("user", user_id)):
+            limit, period = self.windows[name]
+            hits = self._hits.pop((name, key), None) or deque()
+            hits.append(now)
+            while hits[0] <= now - period:
+                hits.popleft()
+            self._hits[(name, key)] = hits  # re-inserted at the back: most recently used
+            if len(hits) >= limit and not tripped:
+                tripped = name
+                hits.clear()  # the next strike needs a fresh burst
+
+        if not tripped: return None
+
+        strikes = self._strikes.get(user_id)
+        if not strikes or now - strikes[1] > STRIKE_DECAY:
+            strikes = self._strikes[user_id] = [0, now]
+        strikes[0] += 1
+        strikes[1] = now
+        duration = min(self.base * 2 ** (strikes[0] - 1), self.cap)
+        self._locked[user_id] = now + duration
+        self.lockouts += 1
+        return duration, tripped, strikes[0]
+
+    def _expire(self, now):
+        # Front of the OrderedDict = least recently used; stop at the first live key
+        longest = max(period for _, period in self.windows.values())
+        while self._hits:
+            key, hits = next(iter(self._hits.items()))
+            if hits and hits[-1] > now - longest:
+                break
+            del self._hits[key]
+
+    def __len__(self):
+        return len(self._hits)
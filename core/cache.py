@@ -0,0 +1,54 @@
+# --- HOT-STATE CACHE ---
+# flags, config, role_rewards and banlist are tiny and only change through
+# Admin commands, yet the submission path used to SELECT them on every click.
+# Tables are loaded lazily in one query each and dropped by invalidate().
+
+from core.promotions import RoleThresholds
+
+
+class HotCache:
+    """Process-wide read-through cache for the small, rarely-written tables."""
+
+    TABLES = ("flags", "config", "role_rewards", "banlist")
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._data: dict[str, object] = {}
+        # Bumped on every invalidation so a load that raced a write is discarded
+        self._gen: dict[str, int] = {t: 0 for t in self.TABLES}
+
+    def invalidate(self, *tables):
+        """Drop cached tables (all of them if none given). Call after every write."""
+        for table in tables or self.TABLES:
+            self._data.pop(table, None)
+            self._gen[table] += 1
+
+    async def _load(self, table, query, build):
+        if table in self._data:
+            return self._data[table]
+        gen = self._gen[table]
+        async with self.bot.db.execute(query) as cursor:
+            value = build(await cursor.fetchall())
+        if gen == self._gen[table]:
+            self._data[table] = value
+        return value
+
+    # --- TABLE ACCESSORS ---
+    async def flags(self) -> dict[str, dict]:
+        return await self._load("flags", "SELECT * FROM flags", lambda rows: {r['challenge_id']: dict(r) for r in rows})
+
+    async def flag(self, challenge_id) -> dict | None:
+        return (await self.flags()).get(challenge_id)
+
+    async def config(self, key):
+        """Channel/role IDs and message IDs stored in the config table."""
+        table = await self._load("config", "SELECT key, value FROM config", lambda rows: {r[0]: r[1] for r in rows})
+        return table.get(key)
+
+    async def thresholds(self) -> RoleThresholds:
+        """role_rewards as a bisectable threshold table."""
+        return await self._load("role_rewards", "SELECT points, role_id FROM role_rewards", RoleThresholds)
+
+    async def is_banned(self, user_id) -> bool:
+        banned = await self._load("banlist", "SELECT user_id FROM banlist", lambda rows: {r[0] for r in rows})
+        return user_id in banned
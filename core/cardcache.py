@@ -0,0 +1,65 @@
+import asyncio
+import os
+from collections import OrderedDict
+
+# --- RENDERED CARD CACHE ---
+# Encoded cards keyed by everything drawn on them, so a key only ever maps to one image and
+# nothing needs invalidating: a changed score, name or avatar is simply a different key.
+# Least recently used cards are evicted once the total size passes CARD_CACHE_MB.
+# Concurrent requests for the same key share one in-flight render.
+
+
+class CardCache:
+    """Byte-bounded LRU of PNG bytes with single-flight rendering."""
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes or int(float(os.getenv('CARD_CACHE_MB') or 32) * 1024 * 1024)
+        self._cards: OrderedDict[tuple, bytes] = OrderedDict()
+        self._inflight: dict[tuple, asyncio.Future] = {}
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.joined = 0      # requests that waited on another request's render
+        self.evictions = 0
+
+    def get(self, key):
+        png = self._cards.get(key)
+        if png is not None:
+            self._cards.move_to_end(key)
+        return png
+
+    def put(self, key, png):
+        old = self._cards.pop(key, None)
+        if old is not None: self.size -= len(old)
+        if len(png) > self.max_bytes: return
+        self._cards[key] = png
+        self.size += len(png)
+        while self.size > self.max_bytes:
+            _, evicted = self._cards.popitem(last=False)
+            self.size -= len(evicted)
+            self.evictions += 1
+
+    async def get_or_render(self, key, render):
+        """Cached PNG for key, else the result of `await render()` (shared by concurrent callers; None is not cached)."""
+        png = self.get(key)
+        if png is not None:
+            self.hits += 1
+            return png
+
+        task = self._inflight.get(key)
+        if task:
+            self.joined += 1
+        else:
+            self.misses += 1
+            task = self._inflight[key] = asyncio.ensure_future(render())
+            task.add_done_callback(lambda t: self._settle(key, t))
+        # Shielded: one caller giving up does not cancel the render for the others
+        return await asyncio.shield(task)
+
+    def _settle(self, key, task):
+        self._inflight.pop(key, None)
+        if not task.cancelled() and task.exception() is None and task.result() is not None:
+            self.put(key, task.result())
+
+    def __len__(self):
+        return len(self._cards)
@@ -0,0 +1,305 @@
+import os
+from io import BytesIO
+
+from PIL import Image, ImageDraw, ImageOps
+
+from core.fonts import FontRegistry, SpriteCache
+
+# --- PROFILE CARD RENDERER ---
+# Everything on the 1800x700 dossier that depends only on the colour tier (grid, glow
+# edges, CLASSIFIED stamp, staples, corner accents, empty stat boxes) is drawn once per
+# tier and kept as a base layer. A card is a copy of that layer plus the per-agent
+# content (id, avatar, name, clearance role, stats, progress, HUD tags). The role badge
+# depends only on the tier too, but long names descend into it and it has to cover
+# them, so it is drawn after the name.
+
+WIDTH, HEIGHT = 1800, 700
+BOT_POINTS = 999999  # the bot's easter-egg card
+
+# tier -> (primary, badge fill, badge text, role badge, background)
+TIERS = {
+    "champion": ((255, 215, 0), (40, 30, 0), (255, 230, 150), "CHAMPION", (20, 22, 25)),
+    "vanguard": ((229, 228, 226), (45, 45, 50), (255, 255, 255), "VANGUARD", (20, 22, 25)),
+    "challenger": ((205, 127, 50), (40, 20, 10), (255, 200, 180), "CHALLENGER", (20, 22, 25)),
+    "sentinel": ((220, 20, 60), (50, 10, 15), (255, 200, 200), "SENTINEL", (20, 22, 25)),
+    "operative": ((0, 255, 230), (0, 40, 40), (200, 255, 255), "OPERATIVE", (20, 22, 25)),
+    "recruit": ((100, 100, 100), (30, 30, 35), (200, 200, 200), "RECRUIT", (20, 22, 25)),
+    # Royal Emerald & Jade Tech theme on Deep Imperial Navy
+    "bot": ((0, 255, 120), (0, 40, 20), (150, 255, 200), "SYSTEM CORE", (0, 10, 30)),
+}
+
+CAT_INFO = {
+    "WEB": ("WEB", (0, 255, 230)),
+    "CRYPTO": ("CRY", (255, 230, 0)),
+    "PWN": ("PWN", (255, 0, 80)),
+    "REV": ("REV", (180, 0, 255)),
+    "FORENSICS": ("FOR", (0, 255, 100)),
+    "OSINT": ("OSI", (255, 150, 0)),
+    "MISC": ("MSC", (180, 180, 180))
+}
+
+AVATAR_X, AVATAR_Y, AVATAR_SIZE = 100, 135, 400
+STATS = ((600, "RANK"), (980, "SCORE"), (1360, "FLAGS"))
+STAT_Y = 310
+
+
+def tier_for(rank, points):
+    """Colour tier of a card: bot, podium places, top 10, zero points or the default."""
+    if points == BOT_POINTS: return "bot"
+    try:
+        rank_num = int(str(rank).replace("#", ""))
+    except ValueError:
+        rank_num = 999
+    if rank_num == 1: return "champion"
+    if rank_num == 2: return "vanguard"
+    if rank_num == 3: return "challenger"
+    if 4 <= rank_num <= 10: return "sentinel"
+    if points == 0: return "recruit"
+    return "operative"
+
+
+def prepare_avatar(raw):
+    """Decoded, thumbnailed and circle-masked avatar as RGBA PNG bytes (None if undecodable)."""
+    try:
+        with BytesIO(raw) as av_buf:
+            with Image.open(av_buf) as av_raw:
+                av_raw.thumbnail((AVATAR_SIZE, AVATAR_SIZE), Image.Resampling.LANCZOS)
+                with av_raw.convert("RGBA") as avatar:
+                    with Image.new("L", avatar.size, 0) as mask:
+                        ImageDraw.Draw(mask).ellipse((0, 0, avatar.size[0], avatar.size[1]), fill=255)
+                        with ImageOps.fit(avatar, mask.size, centering=(0.5, 0.5)) as output:
+                            output.putalpha(mask)
+                            buf = BytesIO(); output.save(buf, format="PNG", compress_level=1)
+                            return buf.getvalue()
+    except Exception:
+        return None
+
+
+# --- OUTPUT ENCODINGS ---
+# encoding -> (file extension, what it trades). Default: CARD_FORMAT, else "png".
+ENCODINGS = {
+    "png": ("png", "lossless, zlib level CARD_PNG_LEVEL (default 6)"),
+    "png-max": ("png", "lossless, smallest PNG, slowest encode"),
+    "palette": ("png", "256-colour quantized PNG"),
+    "webp": ("webp", "lossless WebP"),
+    "webp-lossy": ("webp", "lossy WebP, quality 80"),
+    "preview": ("png", "half resolution (900x350) PNG"),
+}
+
+
+def encode(card, encoding="png"):
+    """Encodes a drawn card with one of ENCODINGS; returns the bytes."""
+    buf = BytesIO()
+    if encoding == "png-max":
+        card.save(buf, format="PNG", optimize=True)
+    elif encoding == "palette":
+        with card.quantize(256, method=Image.Quantize.FASTOCTREE) as pal:
+            pal.save(buf, format="PNG", compress_level=6)
+    elif encoding == "webp":
+        card.save(buf, format="WEBP", lossless=True, method=4)
+    elif encoding == "webp-lossy":
+        card.save(buf, format="WEBP", quality=80, method=2)
+    elif encoding == "preview":
+        with card.reduce(2) as small:
+            small.save(buf, format="PNG", compress_level=6)
+    else:
+        card.save(buf, format="PNG", compress_level=int(os.getenv('CARD_PNG_LEVEL') or 6))
+    return buf.getvalue()
+
+
+def _octagon(x, y, w, h, c):
+    return [(x+c, y), (x+w-c, y), (x+w, y+c), (x+w, y+h-c), (x+w-c, y+h), (x+c, y+h), (x, y+h-c), (x, y+c)]
+
+
+class CardRenderer:
+    """Draws profile cards on top of per-tier base layers built on first use."""
+
+    def __init__(self, font_path="font.ttf"):
+        self.fonts = FontRegistry(font_path)
+        self.sprites = SpriteCache(self.fonts)
+        # Scaled fonts for 1800x700 resolution
+        self.title_font = self.fonts.get(130)
+        self.badge_font = self.fonts.get(60)
+        self.label_font = self.fonts.get(50)
+        self.value_font = self.fonts.get(110)
+        self.small_font = self.fonts.get(35)
+        self.micro_font = self.fonts.get(24)
+        self._layers: dict[str, Image.Image] = {}
+
+    def layer(self, tier):
+        """The static base layer for a tier (built once, never mutated)."""
+        base = self._layers.get(tier)
+        if base is None:
+            base = self._layers[tier] = self._build_layer(tier)
+        return base
+
+    def warm(self):
+        for tier in TIERS: self.layer(tier)
+
+    def _build_layer(self, tier):
+        primary, fill_color, b_text, role, bg_color = TIERS[tier]
+        width, height = WIDTH, HEIGHT
+        card = Image.new("RGBA", (width, height), bg_color)
+        draw = ImageDraw.Draw(card)
+
+        # --- DIGITAL GRID BACKGROUND ---
+        for x in range(0, width, 80): draw.line([(x, 0), (x, height)], fill=(30, 35, 40), width=2)
+        for y in range(0, height, 80): draw.line([(0, y), (width, y)], fill=(30, 35, 40), width=2)
+
+        # --- NEON GLOW EDGES ---
+        glow_color = primary + (50,)
+        for i in range(1, 4):
+            gw = 6 + (i * 4)
+            draw.rectangle([0, 0, width, height], outline=glow_color, width=gw)
+            # Avatar border glow centered between metadata and clearance box
+            draw.ellipse((100-i, 135-i, 500+i, 535+i), outline=glow_color, width=gw)
+
+        # --- DOSSIER STAMP ---
+        if self.fonts.available:
+            # Reduced size to 220 to stay inside boundaries
+            stamp_font = self.fonts.get(220)
+            stamp_txt = "CLASSIFIED"
+            with Image.new("RGBA", (1300, 400), (0,0,0,0)) as stamp_img:
+                s_draw = ImageDraw.Draw(stamp_img)
+                # Brighter fill and much lighter outline for high contrast
+                s_draw.text((10, 10), stamp_txt, fill=(255, 40, 40, 45), font=stamp_font, stroke_width=2, stroke_fill=(255, 160, 160, 60))
+                # Slight rotation (10 deg) to ensure it fits vertically
+                with stamp_img.rotate(10, expand=1, resample=Image.Resampling.BICUBIC) as rotated_stamp:
+                    card.paste(rotated_stamp, (400, 180), rotated_stamp)
+
+        # --- STAPLES (Top Left) ---
+        draw.line([(40, 30), (40, 110)], fill=(100, 105, 110), width=12)
+        draw.line([(70, 30), (70, 110)], fill=(100, 105, 110), width=12)
+        draw.text((110, 65), "STATUS: ACTIVE_OPERATIVE", fill=primary, font=self.micro_font)
+
+        # --- CORNER ACCENTS ---
+        blen, bw = 200, 12
+        draw.line([(0, 0), (blen, 0)], fill=primary, width=bw); draw.line([(0, 0), (0, blen)], fill=primary, width=bw)
+        draw.line([(width, height), (width-blen, height)], fill=primary, width=bw); draw.line([(width, height), (width, height-blen)], fill=primary, width=bw)
+
+        # --- CLEARANCE ROLE BOX FRAME (Bottom Left) ---
+        draw.polygon(_octagon(100, 580, 400, 70, 10), fill=fill_color, outline=primary, width=3)
+
+        # --- STAT BOX FRAMES ---
+        for x, label in STATS:
+            draw.polygon(_octagon(x, STAT_Y, 340, 220, 20), fill=(20, 25, 30), outline=primary, width=4)
+            draw.text((x+30, STAT_Y+20), label, fill=primary, font=self.label_font)
+        return card
+
+    def _draw_badge(self, draw, tier):
+        primary, fill_color, b_text, role = TIERS[tier][:4]
+        bx, by, bh, cut = 600, 180, 90, 24
+        bw_val = draw.textbbox((0, 0), role, font=self.badge_font)[2] + 140
+        draw.polygon(_octagon(bx, by, bw_val, bh, cut), fill=fill_color, outline=primary, width=4)
+        ds, dcx, dcy = 20, bx + 50, by + 44
+        draw.polygon([(dcx, dcy-ds), (dcx+ds, dcy), (dcx, dcy+ds), (dcx-ds, dcy)], fill=primary)
+        draw.text((bx+100, by+8), role, fill=b_text, font=self.badge_font)
+
+    def draw(self, user_id, display_name, rank, points, solves, avatar_png, next_goal=None, last_cats=None, earned_role="RECRUIT"):
+        """The card as an RGBA image (caller closes it)."""
+        tier = tier_for(rank, points)
+        primary, fill_color = TIERS[tier][0], TIERS[tier][1]
+        is_bot = points == BOT_POINTS
+
+        sprites = self.sprites
+        card = self.layer(tier).copy()
+        draw = ImageDraw.Draw(card)
+
+        # --- METADATA (Top Left - Under Staples) ---
+        draw.text((110, 35), f"ID_REF: {user_id}", fill=(primary[0], primary[1], primary[2], 120), font=self.micro_font)
+
+        ax, ay, asz = AVATAR_X, AVATAR_Y, AVATAR_SIZE
+        if avatar_png:
+            try:
+                with BytesIO(avatar_png) as av_buf:
+                    with Image.open(av_buf) as circle:
+                        card.paste(circle, (ax, ay), circle)
+            except Exception: avatar_png = None # Trigger fallback if image processing fails
+
+        if not avatar_png:
+            # --- INITIALS FALLBACK ---
+            initial = display_name[0].upper() if display_name else "?"
+            draw.ellipse((ax, ay, ax+asz, ay+asz), fill=fill_color, outline=primary, width=4)
+            i_bbox = sprites.bbox(initial, 250)
+            i_w = i_bbox[2] - i_bbox[0]
+            i_h = i_bbox[3] - i_bbox[1]
+            sprites.draw(card, (ax + (asz - i_w)//2, ay + (asz - i_h)//2 - 30), initial, 250, primary)
+
+        # Inner circle border (Always drawn for sharpness)
+        draw.ellipse((ax, ay, ax+asz, ay+asz), outline=primary, width=4)
+        draw.text((600, 50), display_name.upper(), fill="white", font=self.title_font)
+
+        # --- CLEARANCE ROLE (centered in the frame) ---
+        cr_x, cr_y, cr_w, cr_h = 100, 580, 400, 70
+        cr_bbox = sprites.bbox(earned_role, 35)
+        cr_tw = cr_bbox[2]-cr_bbox[0]
+        cr_th = cr_bbox[3]-cr_bbox[1]
+        sprites.draw(card, (cr_x+(cr_w-cr_tw)//2, cr_y+(cr_h-cr_th)//2-4), earned_role, 35, primary)
+
+        # --- ROLE BADGE (over the name's descenders) ---
+        self._draw_badge(draw, tier)
+
+        # --- PROGRESS BAR ---
+        if next_goal:
+            bar_x, bar_y, bar_w, bar_h = 600, 650, 1100, 20
+            percent = min(1.0, points / next_goal)
+            draw.rectangle([bar_x, bar_y, bar_x+bar_w, bar_y+bar_h], fill=(30, 30, 35)) # Back
+            draw.rectangle([bar_x, bar_y, bar_x+int(bar_w*percent), bar_y+bar_h], fill=primary) # Fill
+
+            progress_text = f"CLEARANCE PROGRESS: {int(percent*100)}%"
+            goal_text = f"{next_goal} PTS GOAL"
+            goal_w = sprites.bbox(goal_text, 35)[2]
+            sprites.draw(card, (bar_x, bar_y-45), progress_text, 35, primary)
+            sprites.draw(card, (bar_x + bar_w - goal_w, bar_y-45), goal_text, 35, primary)
+        else:
+            # --- CENTERED MAX CLEARANCE TEXT ---
+            # Centered under the three stat boxes (600 .. 1700 -> 1150)
+            m_text = "ARCHITECT OF THE SIMULATION" if is_bot else "MAX CLEARANCE LEVEL ATTAINED"
+            m_bbox = sprites.bbox(m_text, 50)
+            m_w = m_bbox[2] - m_bbox[0]
+            sprites.draw(card, (1150 - (m_w//2), 580), m_text, 50, primary)
+
+        # --- STAT VALUES ---
+        for (x, lab), val in zip(STATS, (rank, points, solves)):
+            display_val = "∞" if is_bot and lab in ["RANK", "SCORE"] else str(val)
+            # --- BOT OVERRIDES ---
+            if is_bot:
+                if lab == "RANK": display_val = "[ROOT]"
+                if lab == "FLAGS": display_val = "KERNEL"
+
+            # Use smaller font for longer words to prevent overflow
+            v_font = self.value_font
+            v_y = STAT_Y + 90
+            if len(display_val) > 5:
+                v_font = self.badge_font # Size 60
+                v_y = STAT_Y + 115 # Lowered to align with infinity symbols
+            draw.text((x+30, v_y), display_val, fill="white", font=v_font)
+
+        # --- RECENT SPECIALIZATION HUD TAGS (Top Right) ---
+        if last_cats:
+            # Box Specs (Miniature version of main boxes)
+            tw, th, tc = 160, 70, 10
+            curr_x = WIDTH - 100 - tw
+            top_y = 190  # aligned with the role badge
+
+            for cat in reversed(last_cats):
+                label, clr = CAT_INFO.get(cat, (cat[:3].upper(), (200, 200, 200)))
+
+                # --- BOT TAG OVERRIDE (RGB) ---
+                if is_bot:
+                    if label == "SYS": clr = (255, 50, 50)   # Red
+                    elif label == "SQL": clr = (50, 255, 50) # Green
+                    elif label == "ENC": clr = (50, 100, 255)# Blue
+
+                tp = _octagon(curr_x, top_y, tw, th, tc)
+                draw.polygon(tp, fill=(20, 25, 30), outline=clr, width=3)
+                draw.polygon(tp, outline=clr + (40,), width=6)  # glow
+
+                bbox = sprites.bbox(label, 35)
+                t_w = bbox[2] - bbox[0]
+                t_h = bbox[3] - bbox[1]
+                sprites.draw(card, (curr_x + (tw - t_w)//2, top_y + (th - t_h)//2 - 4), label, 35, clr)
+
+                curr_x -= (tw + 20) # Space for next tag
+
+        return card
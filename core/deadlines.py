@@ -0,0 +1,135 @@
+import asyncio
+import heapq
+import time
+
+# --- DEADLINE SCHEDULER ---
+# check_pending_posts and check_expiry used to poll flags every 60s: missions posted up to
+# a minute late, expiry cards lagged, and the table was scanned even with nothing due.
+# Upcoming start_time (unposted) and end_time (posted) deadlines are now kept in a min-heap,
+# loaded once at startup. The task sleeps until the earliest one and fires it on time.
+# Unposted missions also get a 'prepare' entry PREPARE_LEAD seconds ahead of start_time.
+# /post, /edit and /delete call reschedule(); an entry superseded by a reschedule stays in
+# the heap and is skipped when popped (lazy deletion), so updates are O(log n).
+
+MAX_SLEEP = 300      # re-check the clock at least this often (wall-clock jumps)
+PREPARE_LEAD = 30    # build release payloads this many seconds before start_time
+RETRY_DELAY = 60     # a post whose channel was unavailable is retried after this
+
+
+class DeadlineScheduler:
+    """Fires Admin.prepare() ahead of and Admin.release() at start_time, Admin.expire() at end_time."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._heap = []       # (when, kind, challenge_id)
+        self._due = {}        # (kind, challenge_id) -> when; the live entries
+        self._changed = asyncio.Event()
+        self._task = None
+        self.fired = 0
+
+    async def load(self, db):
+        self._heap, self._due = [], {}
+        async with db.execute("SELECT challenge_id, start_time, end_time, posted_at, msg_id FROM flags") as cursor:
+            for row in await cursor.fetchall(): self._plan(*row)
+        self._changed.set()
+
+    def start(self):
+        if not self._task: self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def _plan(self, challenge_id, start_time, end_time, posted_at, msg_id):
+        self.unschedule(challenge_id)
+        if posted_at is None and start_time:
+            self.push('prepare', challenge_id, start_time - PREPARE_LEAD)
+            self.push('post', challenge_id, start_time)
+        elif msg_id and end_time: self.push('expire', challenge_id, end_time)
+
+    def push(self, kind, challenge_id, when):
+        self._due[(kind, challenge_id)] = when
+        heapq.heappush(self._heap, (when, kind, challenge_id))
+        self._changed.set()
+
+    def unschedule(self, challenge_id):
+        self._due.pop(('prepare', challenge_id), None)
+        self._due.pop(('post', challenge_id), None)
+        self._due.pop(('expire', challenge_id), None)
+
+    async def reschedule(self, challenge_id):
+        """Re-reads one challenge's deadlines after it was posted, edited or deleted."""
+        async with self.bot.db.execute("SELECT challenge_id, start_time, end_time, posted_at, msg_id FROM flags WHERE challenge_id = ?", (challenge_id,)) as cursor:
+            row = await cursor.fetchone()
+        if row: self._plan(*row)
+        else: self.unschedule(challenge_id)
+        self._changed.set()
+
+    def pending(self, kind):
+        return sum(1 for k, _ in self._due if k == kind)
+
+    def next_in(self):
+        """Seconds until the next live deadline, or None."""
+        return min(self._due.values()) - time.time() if self._due else None
+
+    def _pop_due(self, now):
+        due = {'prepare': [], 'post': [], 'expire': []}
+        while self._heap and self._heap[0][0] <= now:
+            when, kind, challenge_id = heapq.heappop(self._heap)
+            if self._due.get((kind, challenge_id)) != when: continue  # superseded
+            del self._due[(kind, challenge_id)]
+            due[kind].append(challenge_id)
+        # Drop dead entries left on top so the next sleep is computed from a live one
+        while self._heap and self._due.get((self._heap[0][1], self._heap[0][2])) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+        return due
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            self._changed.clear()
+            due = self._pop_due(time.time())
+            if any(due.values()):
+                await self._fire(due)
+                continue
+            delay = min(self._heap[0][0] - time.time(), MAX_SLEEP) if self._heap else MAX_SLEEP
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=max(delay, 0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _fire(self, due):
+        admin = self.bot.get_cog('Admin')
+        if not admin:
+            for kind in ('post', 'expire'):
+                for challenge_id in due[kind]: self.push(kind, challenge_id, time.time() + RETRY_DELAY)
+            return
+
+        # Missions due now are built during the release itself
+        posting = set(due['post'])
+        prepare = [c for c in due['prepare'] if c not in posting]
+        if prepare:
+            try:
+                await admin.prepare(prepare)
+            except Exception as e:
+                print(f"⚠️ Release preparation failed: {e}")
+
+        if due['post']:
+            try:
+                failed = await admin.release(due['post'])
+            except Exception as e:
+                print(f"❌ Scheduled release failed: {e}")
+                failed = due['post']
+            for challenge_id in failed: self.push('post', challenge_id, time.time() + RETRY_DELAY)
+            self.fired += len(due['post']) - len(failed)
+
+        for challenge_id in due['expire']:
+            try:
+                await admin.expire(challenge_id)
+                self.fired += 1
+            except Exception as e:
+                print(f"❌ Error expiring {challenge_id}: {e}")
+
+    def __len__(self):
+        return len(self._due)
@@ -0,0 +1,86 @@
+import threading
+from collections import OrderedDict
+
+from PIL import Image, ImageDraw, ImageFont
+
+# --- FONT REGISTRY & TEXT SPRITES ---
+# Every size the card uses is loaded once when the renderer is built. Text that repeats
+# across cards (clearance roles, HUD tags, progress labels, initials) is rasterized once
+# into a coverage mask with its bounding box; drawing it is then a single masked fill
+# with the wanted colour, pixel-identical to ImageDraw.text. Names and numbers are still
+# drawn per request.
+
+CARD_SIZES = (24, 35, 50, 60, 110, 130, 220, 250)
+SPRITE_LIMIT = 4096
+
+
+class FontRegistry:
+    """font.ttf at every card size, loaded once. Falls back to Pillow's default font."""
+
+    def __init__(self, path="font.ttf", sizes=CARD_SIZES):
+        self.path = path
+        self._fonts = {}
+        self.available = True
+        for size in sizes: self.get(size)
+
+    def get(self, size):
+        font = self._fonts.get(size)
+        if font is None:
+            try:
+                font = ImageFont.truetype(self.path, size)
+            except Exception:
+                self.available = False
+                font = ImageFont.load_default()
+            self._fonts[size] = font
+        return font
+
+
+class SpriteCache:
+    """LRU of rasterized text masks keyed by (text, size); colour is applied when pasting."""
+
+    def __init__(self, fonts, limit=SPRITE_LIMIT):
+        self.fonts = fonts
+        self.limit = limit
+        self._sprites: OrderedDict[tuple, tuple] = OrderedDict()
+        self._lock = threading.Lock()  # renders may run on several executor threads
+        self.hits = 0
+        self.misses = 0
+
+    def sprite(self, text, size):
+        """(mask or None, bbox) for text at size; bbox as from textbbox((0, 0), ...)."""
+        key = (text, size)
+        with self._lock:
+            entry = self._sprites.get(key)
+            if entry:
+                self._sprites.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        font = self.fonts.get(size)
+        bbox = font.getbbox(text)
+        left, top, right, bottom = bbox
+        mask = None
+        if right > left and bottom > top:
+            mask = Image.new("L", (right - left, bottom - top))
+            ImageDraw.Draw(mask).text((-left, -top), text, fill=255, font=font)
+        entry = (mask, bbox)
+
+        with self._lock:
+            self.misses += 1
+            self._sprites[key] = entry
+            if len(self._sprites) > self.limit:
+                self._sprites.popitem(last=False)
+        return entry
+
+    def bbox(self, text, size):
+        return self.sprite(text, size)[1]
+
+    def draw(self, card, xy, text, size, fill):
+        """Same pixels as ImageDraw.Draw(card).text(xy, text, fill=fill, font=<size>)."""
+        mask, (left, top, right, bottom) = self.sprite(text, size)
+        if mask:
+            x, y = xy
+            card.paste(fill, (x + left, y + top, x + right, y + bottom), mask)
+
+    def __len__(self):
+        return len(self._sprites)
@@ -0,0 +1,60 @@
+import functools
+import time
+from typing import NamedTuple
+
+# --- SOLVE LEDGER ---
+# Recording a solve used to be five separate awaits (INSERT, COUNT, INSERT OR IGNORE,
+# UPDATE, SELECT). Two correct submissions could interleave between them on the shared
+# connection and both be counted as first blood. The solve is now a single write job run
+# by the WriteCoordinator, which executes jobs one at a time inside its batch transaction,
+# with RETURNING folding the reads into the writes. The solve is timestamped inside the
+# job too, so ordinals (commit order) and timestamps (first blood, solver lists) agree.
+
+
+class SolveReceipt(NamedTuple):
+    solve_index: int              # 0 = first blood, 1 = second, ...
+    bonus: int
+    awarded: int                  # base points + bonus
+    new_total: int                # player's score after the credit
+    solve_count: int              # player's solves including this one
+    prev_solver: int | None       # most recent earlier solver (collusion check)
+    prev_ts: float | None
+    timestamp: float              # when the solve was recorded
+
+
+async def _solve_job(db, user_id, username, challenge_id, base_points, bonuses):
+    timestamp = time.time()
+    # Ordinal = number of *other* solvers, which is unique because jobs never interleave
+    async with db.execute("""
+        INSERT INTO solves (user_id, challenge_id, timestamp) VALUES (?2, ?1, ?3)
+        RETURNING
+            (SELECT COUNT(*) FROM solves WHERE challenge_id = ?1 AND user_id != ?2),
+            (SELECT user_id FROM solves WHERE challenge_id = ?1 AND user_id != ?2 ORDER BY timestamp DESC LIMIT 1),
+            (SELECT MAX(timestamp) FROM solves WHERE challenge_id = ?1 AND user_id != ?2)
+    """, (challenge_id, user_id, timestamp)) as cursor:
+        solve_index, prev_solver, prev_ts = await cursor.fetchone()
+
+    bonus = bonuses.get(solve_index, 0)
+    awarded = base_points + bonus
+    async with db.execute("""
+        INSERT INTO scores (user_id, username, points, last_solve_ts, solve_count) VALUES (?, ?, ?, ?, 1)
+        ON CONFLICT(user_id) DO UPDATE SET
+            points = points + excluded.points,
+            last_solve_ts = MAX(IFNULL(last_solve_ts, 0), excluded.last_solve_ts),
+            solve_count = solve_count + 1
+        RETURNING points, solve_count
+    """, (user_id, username, awarded, timestamp)) as cursor:
+        new_total, solve_count = await cursor.fetchone()
+
+    return SolveReceipt(solve_index, bonus, awarded, new_total, solve_count, prev_solver, prev_ts, timestamp)
+
+
+async def record_solve(writer, user_id, username, challenge_id, base_points, bonuses) -> SolveReceipt:
+    """Atomically records a solve, assigns its ordinal and credits the score.
+
+    Returns once the solve is committed. Raises aiosqlite.IntegrityError (with nothing
+    written) if the user already solved it.
+    """
+    job = functools.partial(_solve_job, user_id=user_id, username=username, challenge_id=challenge_id,
+                            base_points=base_points, bonuses=bonuses)
+    return await writer.run(job)
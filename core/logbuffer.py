@@ -0,0 +1,98 @@
+import asyncio
+import os
+import time
+
+import discord
+
+# --- LOG AGGREGATOR ---
+# Every submission used to send its own embed to the log channels, so a brute-force wave
+# flooded them and spent the REST budget that mission posts and leaderboard edits need.
+# Events are now buffered per channel: a lone event after a quiet period goes out at once,
+# otherwise a flush every LOG_FLUSH_SECONDS packs up to 10 embeds per message, and bursts
+# larger than LOG_DIGEST_THRESHOLD collapse into compact digest embeds.
+
+EMBEDS_PER_MESSAGE = 10          # Discord limit
+DIGEST_CHARS = 3900              # stay under the 4096-char description limit
+
+
+class LogAggregator:
+    """Non-blocking buffer for the challenge-log and wrong-submission channels."""
+
+    def __init__(self, bot, interval=None, digest_threshold=None):
+        self.bot = bot
+        self.interval = interval if interval is not None else float(os.getenv('LOG_FLUSH_SECONDS') or 3)
+        self.digest_threshold = digest_threshold or int(os.getenv('LOG_DIGEST_THRESHOLD') or 30)
+        self._queues: dict[str, list[tuple[discord.Embed, str]]] = {}
+        self._last_flush: dict[str, float] = {}
+        self._wake = asyncio.Event()
+        self._task = None
+        self.events = 0
+        self.messages = 0
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+        for key in list(self._queues):
+            try: await self._flush(key)
+            except Exception: pass
+
+    def emit(self, config_key, embed, summary):
+        """Queues a log event for the channel stored under config_key. summary is its one-line digest form."""
+        self._queues.setdefault(config_key, []).append((embed, summary))
+        self.events += 1
+        self._wake.set()
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while any(self._queues.values()):
+                now = time.monotonic()
+                due = [k for k, q in self._queues.items() if q and now - self._last_flush.get(k, 0) >= self.interval]
+                if not due:
+                    # Let the burst accumulate until the earliest channel may send again
+                    wait = min(self._last_flush[k] + self.interval for k, q in self._queues.items() if q) - now
+                    await asyncio.sleep(wait)
+                    continue
+                for key in due:
+                    try:
+                        await self._flush(key)
+                    except Exception as e:
+                        print(f"⚠️ Log flush failed for {key}: {e}")
+
+    async def _flush(self, key):
+        events, self._queues[key] = self._queues.get(key, []), []
+        self._last_flush[key] = time.monotonic()
+        if not events: return
+
+        channel_id = await self.bot.cache.config(key)
+        channel = self.bot.get_channel(int(channel_id)) if channel_id else None
+        if not channel: return
+
+        if len(events) > self.digest_threshold:
+            for embed in self._digests(events):
+                await channel.send(embed=embed)
+                self.messages += 1
+            return
+
+        for i in range(0, len(events), EMBEDS_PER_MESSAGE):
+            await channel.send(embeds=[embed for embed, _ in events[i:i + EMBEDS_PER_MESSAGE]])
+            self.messages += 1
+
+    def _digests(self, events):
+        """Compact digest embeds (one line per event), split to respect the description limit."""
+        title = f"{events[0][0].title} — Digest ({len(events)} events)"
+        color = events[0][0].color
+        pages, lines, size = [], [], 0
+        for _, summary in events:
+            if size + len(summary) + 1 > DIGEST_CHARS:
+                pages.append(lines); lines, size = [], 0
+            lines.append(summary); size += len(summary) + 1
+        pages.append(lines)
+        return [discord.Embed(title=title if n == 0 else f"{title} ({n + 1}/{len(pages)})", description="\n".join(p), color=color)
+                for n, p in enumerate(pages)]
@@ -0,0 +1,102 @@
+import hashlib
+import json
+from collections import OrderedDict
+
+import discord
+
+# --- MESSAGE HANDLES ---
+# Every visual update used to fetch_message() and then edit(): two REST calls. The ids
+# are already stored (flags.msg_id, config lb_msg_id), so edits and deletes now go
+# straight to a PartialMessage built from (channel_id, message_id). The last embed and
+# view sent to each message are kept, so state such as "already marked expired" can be
+# read locally. A 404 drops the handle and tells the caller to repost.
+#
+# Each embed/view sent is also hashed in a canonical form, and an edit whose payload
+# hashes the same as what the message already shows is skipped without a REST call.
+
+HANDLE_LIMIT = 2048
+
+
+def _strip_ids(data):
+    # Decorator buttons (the leaderboard pager) get a random custom_id per View instance;
+    # posted cards derive theirs from the challenge id already in the embed title.
+    if isinstance(data, dict):
+        return {k: _strip_ids(v) for k, v in data.items() if k != 'custom_id'}
+    if isinstance(data, list):
+        return [_strip_ids(v) for v in data]
+    return data
+
+
+def digest(field, value):
+    """Stable hash of an embed or view as Discord receives it; None for any other field."""
+    if field == 'embed' and value is not None: data = value.to_dict()
+    elif field == 'view' and value is not None: data = _strip_ids(value.to_components())
+    else: return None
+    return hashlib.blake2b(json.dumps(data, sort_keys=True, default=str).encode(), digest_size=16).digest()
+
+
+class MessageHandles:
+    """Edit/delete posted messages by id, remembering the last payload sent to each."""
+
+    def __init__(self, bot, limit=HANDLE_LIMIT):
+        self.bot = bot
+        self.limit = limit
+        self._last: OrderedDict[int, tuple] = OrderedDict()   # message_id -> (embed, view, digests)
+        self.edits = 0
+        self.skipped = 0    # edits that would not have changed anything
+        self.deletes = 0
+        self.missing = 0    # 404s: the message was gone
+
+    def partial(self, channel_id, message_id):
+        # Works without the channel in cache and without a GET
+        return self.bot.get_partial_messageable(channel_id).get_partial_message(message_id)
+
+    def remember(self, message_id, embed=None, view=None, digests=None):
+        old_embed, old_view, known = self._last.pop(message_id, (None, None, {}))
+        known = {**known, **(digests or {})}
+        for field, value in (('embed', embed), ('view', view)):
+            if value is not None and not (digests and field in digests): known[field] = digest(field, value)
+        self._last[message_id] = (embed or old_embed, view or old_view, known)
+        while len(self._last) > self.limit:
+            self._last.popitem(last=False)
+
+    def forget(self, message_id):
+        self._last.pop(message_id, None)
+
+    def last(self, message_id):
+        """(embed, view) last sent to message_id by this process, or None."""
+        entry = self._last.get(message_id)
+        return entry[:2] if entry else None
+
+    async def edit(self, channel_id, message_id, **fields) -> bool:
+        """Edits in one call, or none when nothing changed. False if the message no longer
+        exists; other HTTP errors raise."""
+        digests = {field: digest(field, value) for field, value in fields.items()}
+        entry = self._last.get(message_id)
+        if entry and all(h is not None and entry[2].get(field) == h for field, h in digests.items()):
+            self.skipped += 1
+            self._last.move_to_end(message_id)
+            return True
+
+        try:
+            await self.partial(channel_id, message_id).edit(**fields)
+        except discord.NotFound:
+            self.missing += 1
+            self.forget(message_id)
+            return False
+        self.edits += 1
+        self.remember(message_id, fields.get('embed'), fields.get('view'), digests)
+        return True
+
+    async def delete(self, channel_id, message_id) -> bool:
+        """False if it was already gone."""
+        self.forget(message_id)
+        try:
+            await self.partial(channel_id, message_id).delete()
+        except discord.NotFound:
+            return False
+        self.deletes += 1
+        return True
+
+    def __len__(self):
+        return len(self._last)
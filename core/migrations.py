@@ -0,0 +1,93 @@
+import time
+
+# --- SCHEMA MIGRATIONS ---
+# Each step runs once, in its own transaction, and is recorded in schema_version.
+# Startup on a current database costs a single SELECT. Append new steps to MIGRATIONS;
+# never edit a step that has shipped, since old backups (/import) replay the whole list.
+
+
+async def _v1_baseline(db):
+    """Original schema, including the scheduling/file columns older databases lack."""
+    await db.execute('''CREATE TABLE IF NOT EXISTS flags
+                 (challenge_id TEXT PRIMARY KEY, flag_text TEXT, points INTEGER, category TEXT,
+                  msg_id INTEGER, file_msg_id INTEGER, channel_id INTEGER, image_url TEXT, posted_at INTEGER,
+                  start_time INTEGER, end_time INTEGER, description TEXT, 
+                  connection_info TEXT, file_path TEXT)''')
+
+    async with db.execute("PRAGMA table_info(flags)") as cursor:
+        columns = {row[1] for row in await cursor.fetchall()}
+    for name, col_type in [("start_time", "INTEGER"), ("end_time", "INTEGER"), ("description", "TEXT"),
+                           ("connection_info", "TEXT"), ("file_path", "TEXT"), ("file_msg_id", "INTEGER")]:
+        if name not in columns:
+            await db.execute(f"ALTER TABLE flags ADD COLUMN {name} {col_type}")
+
+    await db.execute('''CREATE TABLE IF NOT EXISTS role_rewards (role_id INTEGER PRIMARY KEY, points INTEGER)''')
+    await db.execute('''CREATE TABLE IF NOT EXISTS scores (user_id INTEGER PRIMARY KEY, username TEXT, points INTEGER)''')
+    await db.execute('''CREATE TABLE IF NOT EXISTS solves (user_id INTEGER, challenge_id TEXT, timestamp REAL, PRIMARY KEY (user_id, challenge_id))''')
+    await db.execute('''CREATE TABLE IF NOT EXISTS banlist (user_id INTEGER PRIMARY KEY)''')
+    await db.execute('''CREATE TABLE IF NOT EXISTS hints (id INTEGER PRIMARY KEY AUTOINCREMENT, challenge_id TEXT, hint_text TEXT, cost INTEGER)''')
+    await db.execute('''CREATE TABLE IF NOT EXISTS config (key TEXT PRIMARY KEY, value INTEGER)''')
+    await db.execute('''CREATE TABLE IF NOT EXISTS unlocked_hints (user_id INTEGER, hint_id INTEGER, PRIMARY KEY (user_id, hint_id))''')
+
+
+async def _v2_leaderboard_columns(db):
+    """Denormalized last_solve_ts / solve_count on scores plus covering indexes for the hot reads."""
+    await db.execute("ALTER TABLE scores ADD COLUMN last_solve_ts REAL")
+    await db.execute("ALTER TABLE scores ADD COLUMN solve_count INTEGER NOT NULL DEFAULT 0")
+    await db.execute("""
+        UPDATE scores SET
+            last_solve_ts = (SELECT MAX(timestamp) FROM solves WHERE solves.user_id = scores.user_id),
+            solve_count = (SELECT COUNT(*) FROM solves WHERE solves.user_id = scores.user_id)
+    """)
+    # Solver lists / first blood / solve ordinals, and a player's recent solves
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_solves_challenge_ts ON solves (challenge_id, timestamp, user_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_solves_user_ts ON solves (user_id, timestamp, challenge_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_unlocked_hints_hint ON unlocked_hints (hint_id)")
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_hints_challenge ON hints (challenge_id)")
+
+
+async def _v3_wrong_attempts(db):
+    """Append-only log of wrong flag submissions (inserted in batches by the WriteCoordinator)."""
+    await db.execute('''CREATE TABLE IF NOT EXISTS wrong_attempts (id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER, challenge_id TEXT, flag TEXT, timestamp REAL)''')
+    await db.execute("CREATE INDEX IF NOT EXISTS idx_wrong_attempts_user_ts ON wrong_attempts (user_id, timestamp)")
+
+
+# (version, name, step) in ascending order
+MIGRATIONS = [
+    (1, "baseline schema", _v1_baseline),
+    (2, "scores.last_solve_ts/solve_count and covering indexes", _v2_leaderboard_columns),
+    (3, "wrong_attempts log", _v3_wrong_attempts),
+]
+LATEST = MIGRATIONS[-1][0]
+
+
+async def schema_version(db) -> int:
+    await db.execute("CREATE TABLE IF NOT EXISTS schema_version (version INTEGER PRIMARY KEY, name TEXT, applied_at INTEGER)")
+    async with db.execute("SELECT MAX(version) FROM schema_version") as cursor:
+        return (await cursor.fetchone())[0] or 0
+
+
+async def migrate(db) -> int:
+    """Brings the database up to LATEST. Returns the number of steps applied."""
+    current = await schema_version(db)
+    if current >= LATEST:
+        return 0
+
+    if db.in_transaction:
+        await db.commit()
+    applied = 0
+    for version, name, step in MIGRATIONS:
+        if version <= current:
+            continue
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            await step(db)
+            await db.execute("INSERT INTO schema_version (version, name, applied_at) VALUES (?, ?, ?)", (version, name, int(time.time())))
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            print(f"❌ Migration {version} ({name}) failed; database left at version {version - 1}.")
+            raise
+        print(f"🛠️ Migrated database to version {version}: {name}")
+        applied += 1
+    return applied
@@ -0,0 +1,57 @@
+import time
+
+import discord
+
+# --- CHALLENGE POSTS ---
+# perform_post and the card refresh used to build the challenge embed separately and had
+# drifted apart ("Points" vs "Pts", a Time Left field without a deadline, the file footer
+# lost on refresh). Both build it here from the flags row now, so a refresh that changes
+# nothing produces exactly the payload already on the message and its edit is skipped.
+
+
+def is_expired(d, now=None):
+    return bool(d['end_time']) and (now or int(time.time())) >= d['end_time']
+
+
+def challenge_post(d, first_blood=None, hints=0, now=None):
+    """(embed, view) for a challenge post. d is its flags row; first_blood is (name, points) or None."""
+    cid = d['challenge_id']
+    expired = is_expired(d, now)
+
+    desc = f"**Objective:**\n```text\n{d['description'] or 'Solve it.'}\n```"
+    if d['connection_info']: desc += f"\n**📡 Connection:**\n```text\n{d['connection_info']}\n```"
+
+    embed = discord.Embed(title=f"🛡️ MISSION: {cid}", description=desc, color=discord.Color.red())
+    embed.add_field(name="💰 Bounty", value=f"**{d['points']} Points**", inline=True)
+    embed.add_field(name="📂 Category", value=f"**{d['category'] or 'General'}**", inline=True)
+    if expired: embed.add_field(name="⏳ Time Left", value="**🔴 Expired**", inline=True)
+    elif d['end_time']: embed.add_field(name="⏳ Time Left", value=f"<t:{d['end_time']}:R>", inline=True)
+
+    fb = f"🥇 **{first_blood[0]}** (+{first_blood[1]})" if first_blood else "*Waiting...*"
+    embed.add_field(name="🩸 First Blood", value=fb, inline=False)
+    if d['image_url']: embed.set_image(url=d['image_url'])
+    if d['file_path'] or d['file_msg_id']: embed.set_footer(text="📁 See attached file below")
+
+    view = discord.ui.View(timeout=None)
+    btn = discord.ui.Button(label="Submit Flag", style=discord.ButtonStyle.green, emoji="🚩", custom_id=f"submit:{cid}")
+    if expired: btn.disabled = True; btn.style = discord.ButtonStyle.danger; btn.label = "Closed"
+    view.add_item(btn)
+    if hints: view.add_item(discord.ui.Button(label="Hints", style=discord.ButtonStyle.gray, emoji="💡", custom_id=f"hints:{cid}"))
+    if first_blood: view.add_item(discord.ui.Button(label="Solvers", style=discord.ButtonStyle.blurple, emoji="👥", custom_id=f"solvers:{cid}"))
+    return embed, view
+
+
+async def load_post(db, d, guild, bonus=0):
+    """Reads first blood and the hint count for flags row d, then builds its post."""
+    cid = d['challenge_id']
+    # Only first blood is shown, so read one row off idx_solves_challenge_ts
+    async with db.execute("SELECT user_id FROM solves WHERE challenge_id = ? ORDER BY timestamp ASC LIMIT 1", (cid,)) as cursor:
+        first = await cursor.fetchone()
+    async with db.execute("SELECT COUNT(*) FROM hints WHERE challenge_id = ?", (cid,)) as cursor:
+        hints = (await cursor.fetchone())[0]
+
+    first_blood = None
+    if first:
+        member = guild.get_member(first[0]) if guild else None
+        first_blood = (member.display_name if member else 'Agent', d['points'] + bonus)
+    return challenge_post(d, first_blood, hints)
@@ -0,0 +1,111 @@
+import asyncio
+import os
+import time
+from collections import deque
+
+# --- SPECULATIVE CARD PRE-RENDERING ---
+# Most /profile traffic during an event comes from the top of the board, right after they
+# solve. After the standings change (debounced), the cards and avatars of whoever just
+# solved and of the top PRERENDER_TOP players are rendered into the card cache in the
+# background. The work is throttled to PRERENDER_BUDGET of one core (each render is
+# followed by a proportional pause), and a cycle is cancelled as soon as interactions
+# arrive faster than PRERENDER_MAX_LOAD per second or a foreground render is queued.
+
+DEBOUNCE = 2.0       # seconds of quiet after a solve before a cycle starts
+LOAD_WINDOW = 5.0    # seconds of interaction history used to judge load
+
+
+class Prerenderer:
+    """Low-priority background renders of the cards most likely to be requested next."""
+
+    def __init__(self, bot, top_n=None, budget=None, max_load=None):
+        self.bot = bot
+        self.top_n = top_n if top_n is not None else int(os.getenv('PRERENDER_TOP') or 10)
+        self.budget = budget or float(os.getenv('PRERENDER_BUDGET') or 0.25)
+        self.max_load = max_load or float(os.getenv('PRERENDER_MAX_LOAD') or 2.0)
+        self._solvers: dict[int, object] = {}   # user_id -> guild, most recent last
+        self._interactions = deque()
+        self._wake = asyncio.Event()
+        self._task = None
+        self._cycle = None
+        self._rendering = 0  # our own render in the pool's queue (not load)
+        self.warmed = 0      # cards ensured in the card cache
+        self.cancelled = 0   # cycles abandoned under load
+
+    def start(self):
+        if self.top_n <= 0 or self._task: return
+        self.bot.add_listener(self._on_interaction, 'on_interaction')
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self.bot.remove_listener(self._on_interaction, 'on_interaction')
+            self._task.cancel()
+            self._task = None
+        if self._cycle:
+            self._cycle.cancel()
+
+    def mark(self, guild, user_id):
+        """Standings changed because user_id solved in guild."""
+        if not self._task or not guild: return
+        self._solvers.pop(user_id, None)
+        self._solvers[user_id] = guild
+        self._wake.set()
+
+    def busy(self):
+        now = time.monotonic()
+        while self._interactions and self._interactions[0] < now - LOAD_WINDOW:
+            self._interactions.popleft()
+        return self.bot.renderer.queued > self._rendering or len(self._interactions) > self.max_load * LOAD_WINDOW
+
+    async def _on_interaction(self, interaction):
+        self._interactions.append(time.monotonic())
+        if self._cycle and not self._cycle.done() and self.busy():
+            self._cycle.cancel()
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            await self._wake.wait()
+            # Let a burst of solves settle into one cycle
+            while self._wake.is_set():
+                self._wake.clear()
+                await asyncio.sleep(DEBOUNCE)
+            if self.busy():
+                await asyncio.sleep(LOAD_WINDOW)
+                self._wake.set()
+                continue
+
+            solvers, self._solvers = self._solvers, {}
+            self._cycle = asyncio.create_task(self._prerender(solvers))
+            try:
+                await self._cycle
+            except asyncio.CancelledError:
+                if self._task is None: raise  # stopping
+                self.cancelled += 1
+            except Exception as e:
+                print(f"⚠️ Pre-render cycle failed: {e}")
+            finally:
+                self._cycle = None
+
+    async def _prerender(self, solvers):
+        cog = self.bot.get_cog('Player')
+        if not cog or not solvers: return
+        guild = next(reversed(solvers.values()))
+        targets = list(reversed(solvers))  # latest solver first
+        targets += [uid for uid, _, _ in self.bot.ranking.page(0, self.top_n) if uid not in solvers]
+
+        for uid in targets:
+            if self.busy(): return
+            member = guild.get_member(uid)
+            if not member: continue
+            start = time.perf_counter()
+            self._rendering = 1
+            try:
+                await cog.card_for(member, guild)
+            finally:
+                self._rendering = 0
+            self.warmed += 1
+            # Stay within the CPU budget: render for t, then idle for t * (1 - budget) / budget
+            took = time.perf_counter() - start
+            await asyncio.sleep(took * (1 - self.budget) / self.budget)
@@ -0,0 +1,98 @@
+import asyncio
+from bisect import bisect_right
+
+# --- RANK PROMOTIONS ---
+# Promotions used to run inline after every correct flag: load role_rewards, walk every
+# threshold and await add_roles once per role, all before the player saw their result.
+# Score changes are now queued to a background worker that coalesces events per member
+# and grants every newly earned role in a single member edit.
+
+RETRY_DELAY = 5  # seconds before a batch that could not load the thresholds is retried
+
+
+class RoleThresholds:
+    """Sorted, bisectable view of role_rewards. Rebuilt only when the rank roles change."""
+
+    def __init__(self, rows):
+        pairs = sorted((points, role_id) for points, role_id in rows)
+        self.points = [p for p, _ in pairs]
+        self.role_ids = [r for _, r in pairs]
+
+    def roles_for(self, points) -> list[int]:
+        """Every role whose threshold has been reached."""
+        return self.role_ids[:bisect_right(self.points, points)]
+
+    def earned(self, points) -> int | None:
+        """Highest role reached, if any."""
+        i = bisect_right(self.points, points)
+        return self.role_ids[i - 1] if i else None
+
+    def next_goal(self, points) -> int | None:
+        """Points needed for the next role, or None at max clearance."""
+        i = bisect_right(self.points, points)
+        return self.points[i] if i < len(self.points) else None
+
+
+class PromotionWorker:
+    """Applies rank roles in the background from score-change events."""
+
+    def __init__(self, bot):
+        self.bot = bot
+        self._pending: dict[tuple[int, int], tuple] = {}    # (guild_id, user_id) -> (guild, points, interaction)
+        self._wake = asyncio.Event()
+        self._task = None
+        self.edits = 0
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def submit(self, guild, user_id, points, interaction=None):
+        """Queues a score change. interaction (already responded to) receives the promotion notice."""
+        if not guild: return
+        self._pending[(guild.id, user_id)] = (guild, points, interaction)
+        self._wake.set()
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            batch, self._pending = self._pending, {}
+            try:
+                thresholds = await self.bot.cache.thresholds()
+            except Exception as e:
+                # e.g. the db is being swapped by /import: keep the batch (newer events win) and retry
+                print(f"⚠️ Promotions delayed: {e}")
+                self._pending = {**batch, **self._pending}
+                self._wake.set()
+                await asyncio.sleep(RETRY_DELAY)
+                continue
+            for (_, user_id), (guild, points, interaction) in batch.items():
+                try:
+                    await self._promote(guild, user_id, points, interaction, thresholds)
+                except Exception as e:
+                    print(f"⚠️ Promotion failed for {user_id}: {e}")
+
+    async def _promote(self, guild, user_id, points, interaction, thresholds):
+        member = guild.get_member(user_id)
+        if not member: return
+        missing = []
+        for role_id in thresholds.roles_for(points):
+            role = guild.get_role(role_id)
+            if role and role not in member.roles:
+                missing.append(role)
+        if not missing: return
+
+        # atomic=False sends one member edit with the full role list instead of one call per role
+        await member.add_roles(*missing, atomic=False, reason="cyberBOT rank promotion")
+        self.edits += 1
+        if interaction:
+            try:
+                await interaction.followup.send(f"🆙 **Promoted!** New clearance: {', '.join(r.name for r in missing)}", ephemeral=True)
+            except Exception:
+                pass
@@ -0,0 +1,272 @@
+from bisect import bisect_left, insort
+
+# --- RANK INDEX ---
+# /profile, /leaderboard and the champion check used to re-aggregate every solve to sort
+# the scoreboard. The standings are now kept in memory, ordered exactly like the
+# leaderboard query (points DESC, last solve ASC, players without solves last), and
+# maintained incrementally: built once at startup, then updated on every score change.
+#
+# Keys live in a bucketed sorted list (buckets of ~LOAD keys) with a Fenwick tree over
+# the bucket sizes, so "rank of user", "page k" and "champion" are O(log n) and an
+# update only shifts one small bucket.
+#
+# Leaderboard pages are served from snapshots tagged with the generation they were taken
+# at. A snapshot is shared until the standings change, reads pages lazily, and freezes
+# every page it has served, so someone clicking through the board never sees ranks shift
+# under them. Pages first read after the standings moved continue from the neighbouring
+# page's last key (keyset) and leave out players this snapshot already showed on another
+# page, so nobody appears twice. A player who moved into a page that was already served
+# is not shown again until the next snapshot.
+
+LOAD = 256
+
+
+class _SortedKeys:
+    """Minimal sorted multiset with positional access."""
+
+    def __init__(self):
+        self._lists: list[list] = []
+        self._maxes: list = []
+        self._tree: list[int] = []
+        self._len = 0
+
+    def __len__(self):
+        return self._len
+
+    # --- Fenwick tree over bucket sizes ---
+    def _rebuild(self):
+        n = len(self._lists)
+        tree = [0] * (n + 1)
+        for i, lst in enumerate(self._lists, 1):
+            tree[i] += len(lst)
+            parent = i + (i & -i)
+            if parent <= n:
+                tree[parent] += tree[i]
+        self._tree = tree
+
+    def _bump(self, i, delta):
+        i += 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, i):
+        """Number of keys in buckets [0, i)."""
+        total = 0
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _locate(self, pos):
+        """Bucket index and offset of the key at position pos."""
+        i, step = 0, 1 << (len(self._tree).bit_length() - 1)
+        while step:
+            nxt = i + step
+            if nxt < len(self._tree) and self._tree[nxt] <= pos:
+                pos -= self._tree[nxt]
+                i = nxt
+            step >>= 1
+        return i, pos
+
+    # --- mutation ---
+    def add(self, key):
+        if not self._lists:
+            self._lists.append([key]); self._maxes.append(key)
+            self._len = 1; self._rebuild()
+            return
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            i -= 1
+        lst = self._lists[i]
+        insort(lst, key)
+        self._maxes[i] = lst[-1]
+        self._len += 1
+        if len(lst) > 2 * LOAD:
+            self._lists[i:i + 1] = [lst[:LOAD], lst[LOAD:]]
+            self._maxes[i:i + 1] = [lst[LOAD - 1], lst[-1]]
+            self._rebuild()
+        else:
+            self._bump(i, 1)
+
+    def remove(self, key):
+        i = bisect_left(self._maxes, key)
+        lst = self._lists[i]
+        del lst[bisect_left(lst, key)]
+        self._len -= 1
+        if not lst:
+            del self._lists[i], self._maxes[i]
+            self._rebuild()
+        else:
+            self._maxes[i] = lst[-1]
+            self._bump(i, -1)
+
+    # --- queries ---
+    def index(self, key):
+        i = bisect_left(self._maxes, key)
+        if i == len(self._maxes):
+            return self._len
+        return self._prefix(i) + bisect_left(self._lists[i], key)
+
+    def index_after(self, key):
+        """Position of the first key greater than key."""
+        pos = self.index(key)
+        return pos + 1 if self.slice(pos, pos + 1) == [key] else pos
+
+    def slice(self, start, stop):
+        out = []
+        if start >= self._len:
+            return out
+        i, j = self._locate(start)
+        while i < len(self._lists) and len(out) < stop - start:
+            out.extend(self._lists[i][j:j + (stop - start - len(out))])
+            i, j = i + 1, 0
+        return out
+
+
+class LeaderboardSnapshot:
+    """The standings at one generation, read a page at a time."""
+
+    def __init__(self, index, per_page=10):
+        self._index = index
+        self.per_page = per_page
+        self.generation = index.generation
+        self.total = len(index)
+        self.pages = max(1, (self.total + per_page - 1) // per_page)
+        self._pages: dict[int, list] = {}   # page -> [(rank, key, username, points)]
+        self._served: set[int] = set()      # user_ids on the pages above
+
+    def page(self, page) -> list[tuple[int, int, str, int]]:
+        """(rank, user_id, username, points) rows for a 0-based page (clamped)."""
+        page = max(0, min(page, self.pages - 1))
+        rows = self._pages.get(page)
+        if rows is None:
+            rows = self._pages[page] = self._read(page)
+            self._served.update(key[3] for _, key, _, _ in rows)
+        return [(rank, key[3], username, points) for rank, key, username, points in rows]
+
+    def _after(self, pos):
+        """Up to per_page keys from position pos on, skipping players already served."""
+        keys, n, found = self._index._keys, self.per_page, []
+        while len(found) < n and pos < len(keys):
+            found += [key for key in keys.slice(pos, pos + n) if key[3] not in self._served]
+            pos += n
+        return found[:n]
+
+    def _before(self, pos):
+        """Up to per_page keys ending just before position pos, skipping players already served."""
+        keys, n, found = self._index._keys, self.per_page, []
+        while len(found) < n and pos > 0:
+            lo = max(0, pos - n)
+            found = [key for key in keys.slice(lo, pos) if key[3] not in self._served] + found
+            pos = lo
+        return found[-n:]
+
+    def _read(self, page):
+        index, n = self._index, self.per_page
+        keys = index._keys
+        if index.generation == self.generation:
+            start = page * n
+            found = keys.slice(start, start + n)
+        elif page - 1 in self._pages and self._pages[page - 1]:
+            # Keyset: continue after the last row this snapshot already showed
+            last_rank, last_key = self._pages[page - 1][-1][:2]
+            found, start = self._after(keys.index_after(last_key)), last_rank
+        elif page + 1 in self._pages and self._pages[page + 1]:
+            first_rank, first_key = self._pages[page + 1][0][:2]
+            found = self._before(keys.index(first_key))
+            start = max(0, first_rank - 1 - len(found))
+        else:
+            start = page * n
+            found = self._after(start)
+        return [(start + i, key, index._entries[key[3]][1], -key[0]) for i, key in enumerate(found, 1)]
+
+
+class RankIndex:
+    """In-memory standings: rank of user, page k and current champion in O(log n)."""
+
+    def __init__(self):
+        self._keys = _SortedKeys()
+        self._entries: dict[int, tuple] = {}    # user_id -> (key, username, points, last_ts)
+        self.generation = 0                     # bumped on every change to the standings
+        self._snapshot = None
+
+    @staticmethod
+    def _key(user_id, points, last_ts):
+        # Mirrors ORDER BY points DESC, (last_ts IS NULL) ASC, last_ts ASC; user_id breaks exact ties
+        return (-points, last_ts is None, last_ts or 0.0, user_id)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, user_id):
+        return user_id in self._entries
+
+    # --- maintenance ---
+    async def load(self, db):
+        """Rebuilds the index from the scores table (startup, /import, /wipe_all)."""
+        async with db.execute("SELECT user_id, username, points, last_solve_ts FROM scores") as cursor:
+            rows = await cursor.fetchall()
+        self._keys = _SortedKeys()
+        self._entries = {}
+        for user_id, username, points, last_ts in rows:
+            self.update(user_id, points, last_ts, username)
+        self.generation += 1
+
+    async def refresh(self, db, user_ids):
+        """Re-reads the given players after a bulk score change (revoke, delete, refunds)."""
+        user_ids = list(set(user_ids))
+        if not user_ids: return
+        marks = ",".join("?" * len(user_ids))
+        async with db.execute(f"SELECT user_id, username, points, last_solve_ts FROM scores WHERE user_id IN ({marks})", user_ids) as cursor:
+            rows = await cursor.fetchall()
+        found = set()
+        for user_id, username, points, last_ts in rows:
+            found.add(user_id)
+            self.update(user_id, points, last_ts, username)
+        for user_id in user_ids:
+            if user_id not in found:
+                self.discard(user_id)
+
+    def update(self, user_id, points, last_ts, username=None):
+        old = self._entries.get(user_id)
+        if old:
+            self._keys.remove(old[0])
+            username = username or old[1]
+        key = self._key(user_id, points, last_ts)
+        self._keys.add(key)
+        self._entries[user_id] = (key, username, points, last_ts)
+        self.generation += 1
+
+    def discard(self, user_id):
+        old = self._entries.pop(user_id, None)
+        if old:
+            self._keys.remove(old[0])
+            self.generation += 1
+
+    # --- queries ---
+    def get(self, user_id):
+        """(username, points, last_ts) or None."""
+        entry = self._entries.get(user_id)
+        return entry[1:] if entry else None
+
+    def rank_of(self, user_id) -> int | None:
+        """1-based position on the leaderboard."""
+        entry = self._entries.get(user_id)
+        return self._keys.index(entry[0]) + 1 if entry else None
+
+    def page(self, page, per_page=10) -> list[tuple[int, str, int]]:
+        """(user_id, username, points) rows for a 0-based page."""
+        keys = self._keys.slice(page * per_page, (page + 1) * per_page)
+        return [(key[3], self._entries[key[3]][1], -key[0]) for key in keys]
+
+    def snapshot(self, per_page=10) -> LeaderboardSnapshot:
+        """Leaderboard snapshot of the current generation (shared until the standings change)."""
+        snap = self._snapshot
+        if not snap or snap.generation != self.generation or snap.per_page != per_page:
+            snap = self._snapshot = LeaderboardSnapshot(self, per_page)
+        return snap
+
+    def champion(self) -> int | None:
+        keys = self._keys.slice(0, 1)
+        return keys[0][3] if keys else None
@@ -0,0 +1,97 @@
+import os
+import time
+from collections import Counter
+
+# --- ADMISSION GATE ---
+# Token buckets keyed per user (and per user+challenge for submissions). Idle buckets
+# are dropped through a hashed timing wheel: each bucket is filed under the second at
+# which it would be full again, and only the slots that elapsed since the last call are
+# visited, so expiry is amortised O(1) instead of a scan of every active user.
+
+# command -> (burst capacity, seconds to regain one token)
+# "<command>/challenge" entries apply per (user, challenge) on top of the per-user bucket.
+RATE_LIMITS = {
+    "submit": (1, 2.0),             # 1 attempt every 2s per user
+    "submit/challenge": (5, 12.0),  # 5 quick guesses per mission, then 1 every 12s
+    "hints": (3, 10.0),
+    "profile": (2, 10.0),           # cards are cached; only changed ones cost a render
+    "leaderboard": (1, 30.0),
+    "help": (1, 30.0),
+}
+
+
+def _limits_from_env(limits):
+    """RATE_LIMIT_<COMMAND>=capacity:seconds overrides, e.g. RATE_LIMIT_PROFILE=2:30."""
+    limits = dict(limits)
+    for name in list(limits):
+        raw = os.getenv("RATE_LIMIT_" + name.upper().replace("/", "_"))
+        if raw:
+            try:
+                cap, period = raw.split(":")
+                limits[name] = (int(cap), float(period))
+            except ValueError:
+                print(f"⚠️ Ignoring malformed rate limit for {name}: '{raw}'")
+    return limits
+
+
+class AdmissionGate:
+    """Per-command token-bucket rate limiter with timing-wheel expiry and rejection counters."""
+
+    def __init__(self, limits=None, tick=1.0):
+        self.limits = _limits_from_env(limits or RATE_LIMITS)
+        self.tick = tick
+        self._buckets: dict[tuple, list] = {}       # key -> [tokens, last_ts, expiry_slot]
+        self._wheel: dict[int, list[tuple]] = {}    # slot -> keys that may be idle by then
+        self._slot = int(time.monotonic() // tick)
+        self.admitted = Counter()
+        self.rejected = Counter()                   # (command, reason) -> count
+
+    def _advance(self, now):
+        slot = int(now // self.tick)
+        while self._slot < slot:
+            self._slot += 1
+            for key in self._wheel.pop(self._slot, ()):
+                bucket = self._buckets.get(key)
+                # Skip keys touched again since being filed (they live in a later slot)
+                if bucket and bucket[2] == self._slot:
+                    del self._buckets[key]
+
+    def _refill(self, key, capacity, period, now):
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            return capacity
+        return min(capacity, bucket[0] + (now - bucket[1]) / period)
+
+    def _store(self, key, tokens, capacity, period, now):
+        expiry = int((now + (capacity - tokens) * period) // self.tick) + 1
+        self._buckets[key] = [tokens, now, expiry]
+        self._wheel.setdefault(expiry, []).append(key)
+
+    def check(self, command, user_id, scope=None) -> float | None:
+        """Takes a token for user_id (and user_id+scope). Returns seconds to wait if rejected, else None."""
+        now = time.monotonic()
+        self._advance(now)
+
+        checks = [((command, user_id), self.limits[command])]
+        scoped = f"{command}/challenge"
+        if scope is not None and scoped in self.limits:
+            checks.append(((scoped, user_id, scope), self.limits[scoped]))
+
+        # Only consume once every bucket involved has a token
+        levels = [self._refill(key, cap, period, now) for key, (cap, period) in checks]
+        wait = max(((1 - tokens) * period for tokens, (_, (_, period)) in zip(levels, checks) if tokens < 1), default=None)
+        if wait is not None:
+            self.rejected[(command, "rate")] += 1
+            return round(wait, 1)
+
+        for tokens, (key, (cap, period)) in zip(levels, checks):
+            self._store(key, tokens - 1, cap, period, now)
+        self.admitted[command] += 1
+        return None
+
+    def reject(self, command, reason):
+        """Counts a rejection decided elsewhere (e.g. the banlist) alongside rate-limit rejections."""
+        self.rejected[(command, reason)] += 1
+
+    def __len__(self):
+        return len(self._buckets)
@@ -0,0 +1,81 @@
+import asyncio
+import os
+import time
+
+# --- COALESCING REFRESH SCHEDULER ---
+# Solves used to await a full leaderboard rebuild and a challenge-card edit inline, so a
+# burst of solves turned into a burst of REST edits (and 429s). Handlers now only mark a
+# target stale; each target is rendered at most once per interval, and anything marked
+# while a render is in flight is rendered again afterwards, so the post always converges
+# on the latest state.
+
+LEADERBOARD = "leaderboard"
+
+
+class RefreshScheduler:
+    """Dirty-flag scheduler for the leaderboard message and challenge cards."""
+
+    def __init__(self, bot, interval=None):
+        self.bot = bot
+        self.interval = interval if interval is not None else float(os.getenv('REFRESH_INTERVAL') or 5)
+        self._dirty: set = set()                # LEADERBOARD or ("card", challenge_id)
+        self._last: dict[object, float] = {}    # target -> monotonic time of last render
+        self._wake = asyncio.Event()
+        self._task = None
+        self.marks = 0
+        self.renders = 0
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    def stop(self):
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+    def mark_leaderboard(self):
+        self._mark(LEADERBOARD)
+
+    def mark_card(self, challenge_id):
+        self._mark(("card", challenge_id))
+
+    def _mark(self, target):
+        self.marks += 1
+        self._dirty.add(target)
+        self._wake.set()
+
+    async def _render(self, target):
+        cog = self.bot.get_cog('Player')
+        if not cog: return
+        if target == LEADERBOARD:
+            await cog.update_leaderboard()
+        else:
+            await cog.update_challenge_card(target[1])
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            while self._dirty:
+                now = time.monotonic()
+                due = [t for t in self._dirty if now - self._last.get(t, 0) >= self.interval]
+                if not due:
+                    # Sleep until the earliest target leaves its interval, or until a new mark
+                    # arrives (a target that was never rendered is due immediately)
+                    wait = min(self._last[t] + self.interval for t in self._dirty) - now
+                    self._wake.clear()
+                    try:
+                        await asyncio.wait_for(self._wake.wait(), wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                for target in due:
+                    self._dirty.discard(target)
+                    self._last[target] = time.monotonic()
+                    self.renders += 1
+                    try:
+                        await self._render(target)
+                    except Exception as e:
+                        print(f"⚠️ Refresh failed for {target}: {e}")
@@ -0,0 +1,108 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from core.cards import CardRenderer, ENCODINGS, encode
+
+# --- RENDER POOL ---
+# Card renders are pure CPU. In the default thread pool they hold the GIL against the
+# gateway and aiosqlite threads, so with RENDER_WORKERS > 0 they run in worker processes
+# instead. Each worker loads the fonts and builds the tier layers once at startup, takes
+# plain values (never discord objects) and sends back finished PNG bytes.
+
+FONT_PATH = "font.ttf"
+
+_worker_cards = None
+
+
+def _init_worker(font_path):
+    global _worker_cards
+    _worker_cards = CardRenderer(font_path)
+    _worker_cards.warm()
+
+
+def _timed_render(cards, args, encoding):
+    """(encoded bytes, draw seconds, encode seconds)"""
+    start = time.perf_counter()
+    with cards.draw(*args) as card:
+        drawn = time.perf_counter()
+        data = encode(card, encoding)
+    return data, drawn - start, time.perf_counter() - drawn
+
+
+def _worker_render(args, encoding):
+    return _timed_render(_worker_cards, args, encoding)
+
+
+class RenderPool:
+    """Runs profile-card renders in a process pool (or the default executor) and times them."""
+
+    def __init__(self, workers=None, encoding=None):
+        self.workers = workers if workers is not None else int(os.getenv('RENDER_WORKERS') or 0)
+        self.encoding = encoding or os.getenv('CARD_FORMAT') or "png"
+        if self.encoding not in ENCODINGS:
+            print(f"⚠️ Unknown CARD_FORMAT '{self.encoding}', using png.")
+            self.encoding = "png"
+        self._pool = None
+        self._cards = None
+        self.queued = 0        # renders submitted and not finished yet
+        self.renders = 0
+        self.render_time = 0.0  # seconds spent drawing + encoding
+        self.wait_time = 0.0    # seconds from submit to result (includes queueing)
+        self.slowest = 0.0
+        self.encodes: dict[str, list] = {}  # encoding -> [count, seconds, bytes]
+
+    @property
+    def cards(self):
+        """In-process renderer (thread mode, fallback, and callers that need it directly)."""
+        if self._cards is None:
+            self._cards = CardRenderer(FONT_PATH)
+            self._cards.warm()
+        return self._cards
+
+    def start(self):
+        if self.workers <= 0:
+            self.cards  # build the tier layers now rather than on the first /profile
+        elif not self._pool:
+            # spawn: never fork a process that already runs the event loop and db threads
+            self._pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                             initializer=_init_worker, initargs=(FONT_PATH,))
+            print(f"🖨️ Render pool: {self.workers} worker process(es).")
+
+    def close(self):
+        if self._pool:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def render(self, user_id, display_name, rank, points, solves, avatar_png, next_goal=None, last_cats=None, earned_role="RECRUIT", encoding=None):
+        """Returns the encoded profile card (encoding defaults to CARD_FORMAT)."""
+        args = (user_id, display_name, rank, points, solves, avatar_png, next_goal, last_cats, earned_role)
+        encoding = encoding or self.encoding
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        self.queued += 1
+        try:
+            if self._pool:
+                try:
+                    data, drew, encoded = await loop.run_in_executor(self._pool, _worker_render, args, encoding)
+                except BrokenProcessPool:
+                    print("⚠️ Render pool crashed; restarting it and rendering in-process.")
+                    self._pool = None
+                    self.start()
+                    data, drew, encoded = await loop.run_in_executor(None, _timed_render, self.cards, args, encoding)
+            else:
+                data, drew, encoded = await loop.run_in_executor(None, _timed_render, self.cards, args, encoding)
+        finally:
+            self.queued -= 1
+
+        took = drew + encoded
+        self.renders += 1
+        self.render_time += took
+        self.wait_time += time.perf_counter() - start
+        self.slowest = max(self.slowest, took)
+        stats = self.encodes.setdefault(encoding, [0, 0.0, 0])
+        stats[0] += 1; stats[1] += encoded; stats[2] += len(data)
+        return data
@@ -0,0 +1,150 @@
+import asyncio
+import contextlib
+import os
+
+# --- GROUP-COMMIT WRITE COORDINATOR ---
+# Every solve, hint purchase and log write used to end in its own commit (one fsync each).
+# Writes are now queued as jobs and flushed together: one transaction, one commit, every
+# few milliseconds or as soon as a batch fills. Callers are resumed only after that commit.
+# Nothing else may write on bot.db directly: multi-statement admin writes take the same
+# lock through transaction(), so a batch and a command never share a transaction.
+
+class WriteCoordinator:
+    """Collects write jobs from concurrent interactions and commits them in batches."""
+
+    def __init__(self, bot, interval=None, max_batch=None):
+        self.bot = bot
+        # Tunable from .env: WRITE_BATCH_MS (window) and WRITE_BATCH_SIZE (early flush)
+        self.interval = interval if interval is not None else float(os.getenv('WRITE_BATCH_MS') or 5) / 1000
+        self.max_batch = max_batch or int(os.getenv('WRITE_BATCH_SIZE') or 64)
+        self._pending: list[tuple[object, asyncio.Future]] = []
+        self._wake = asyncio.Event()
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task = None
+        # Counters for tuning the batch window
+        self.commits = 0
+        self.jobs = 0
+
+    def start(self):
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Flush whatever is still queued and stop the background loop."""
+        if self._task:
+            # Cancel only between batches: an in-flight flush commits and resolves its callers
+            async with self._flush_lock:
+                self._task.cancel()
+            self._task = None
+        while self._pending:
+            await self.flush()
+
+    async def run(self, job):
+        """Queues job (an async callable taking the db) and returns its result once committed.
+
+        The job runs inside a savepoint, so an exception it raises (e.g. IntegrityError)
+        undoes only its own statements and is re-raised here.
+        """
+        future = self._queue(job)
+        if not self._task:
+            await self.flush()  # Not started (e.g. during setup): behave synchronously
+        return await future
+
+    def _queue(self, job):
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((job, future))
+        self._wake.set()
+        if len(self._pending) >= self.max_batch:
+            self._full.set()
+        return future
+
+    def defer(self, sql, params=()):
+        """Queues a statement without waiting for its commit (append-only logs). Failures are printed."""
+        async def job(db):
+            await db.execute(sql, params)
+
+        def report(future):
+            if not future.cancelled() and future.exception():
+                print(f"⚠️ Deferred write failed: {future.exception()}")
+        self._queue(job).add_done_callback(report)
+
+    async def execute(self, sql, params=()):
+        """Queues a single statement; returns its rowcount after commit."""
+        async def job(db):
+            async with db.execute(sql, params) as cursor:
+                return cursor.rowcount
+        return await self.run(job)
+
+    async def executemany(self, sql, seq):
+        async def job(db):
+            await db.executemany(sql, seq)
+        return await self.run(job)
+
+    @contextlib.asynccontextmanager
+    async def transaction(self):
+        """Exclusive write transaction on bot.db for commands, serialized with the batches.
+
+        Commits when the block exits, rolls back if it raises. Don't await run() inside it.
+        """
+        async with self._flush_lock:
+            db = self.bot.db
+            await db.execute("BEGIN IMMEDIATE")
+            try:
+                yield db
+            except BaseException:
+                await db.rollback()
+                raise
+            await db.commit()
+
+    async def _run(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            # Give concurrent interactions a few ms to join this commit
+            try:
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ Write batch failed: {e}")
+            if self._pending:
+                self._wake.set()
+
+    async def flush(self):
+        async with self._flush_lock:
+            batch, self._pending = self._pending[:self.max_batch], self._pending[self.max_batch:]
+            if len(self._pending) < self.max_batch:
+                self._full.clear()
+            if not batch:
+                return
+
+            db = self.bot.db
+            results = []
+            try:
+                await db.execute("BEGIN IMMEDIATE")
+                for job, _ in batch:
+                    await db.execute("SAVEPOINT write_job")
+                    try:
+                        results.append((True, await job(db)))
+                        await db.execute("RELEASE write_job")
+                    except Exception as e:
+                        await db.execute("ROLLBACK TO write_job")
+                        await db.execute("RELEASE write_job")
+                        results.append((False, e))
+                await db.commit()
+            except Exception as e:
+                try: await db.rollback()
+                except Exception: pass
+                for _, future in batch:
+                    if not future.done(): future.set_exception(e)
+                raise
+
+            self.commits += 1
+            self.jobs += len(batch)
+            for (_, future), (ok, value) in zip(batch, results):
+                if future.done(): continue
+                if ok: future.set_result(value)
+                else: future.set_exception(value)
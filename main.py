@@ -5,6 +5,21 @@ import asyncio
 from discord.ext import commands, tasks
 from discord import app_commands
 from dotenv import load_dotenv
+from core.cache import HotCache
+from core.writer import WriteCoordinator
+from core.ratelimit import AdmissionGate
+from core.refresh import RefreshScheduler
+from core.ranking import RankIndex
+from core.migrations import migrate, LATEST
+from core.promotions import PromotionWorker
+from core.logbuffer import LogAggregator
+from core.bruteforce import BruteForceGuard
+from core.renderpool import RenderPool
+from core.cardcache import CardCache
+from core.avatars import AvatarCache
+from core.prerender import Prerenderer
+from core.messages import MessageHandles
+from core.deadlines import DeadlineScheduler
 
 # --- 1. SETUP ---
 load_dotenv()
@@ -23,16 +38,40 @@ class CTFBot(commands.Bot):
         intents.message_content = True  # Needed for prefix command fallback
         super().__init__(command_prefix=PREFIX, intents=intents, help_command=None)
         self.db = None
+        self.cache = HotCache(self)  # flags/config/role_rewards/banlist, invalidated by Admin writes
+        self.writer = WriteCoordinator(self)  # group commit for solve/score/hint/log writes
+        self.gate = AdmissionGate()  # token-bucket rate limits for submissions and commands
+        self.refresh = RefreshScheduler(self)  # coalesced leaderboard / challenge-card re-renders
+        self.ranking = RankIndex()  # in-memory standings for /leaderboard, /profile and the champion
+        self.promotions = PromotionWorker(self)  # background rank-role assignment
+        self.logs = LogAggregator(self)  # batched challenge-log / wrong-submission channel posts
+        self.guard = BruteForceGuard()  # sliding-window wrong-flag counters and escalating lockouts
+        self.renderer = RenderPool()  # profile cards, in worker processes when RENDER_WORKERS > 0
+        self.card_cache = CardCache()  # encoded profile cards keyed by their content
+        self.avatars = AvatarCache()  # masked avatar circles by avatar hash (memory + disk)
+        self.prerender = Prerenderer(self)  # background cards for the top N and the latest solver
+        self.messages = MessageHandles(self)  # fetch-free edits of posted cards by (channel_id, message_id)
+        self.deadlines = DeadlineScheduler(self)  # start_time / end_time min-heap instead of 60s polling
 
     async def setup_hook(self):
         # 0. Storage
         if not os.path.exists('uploads'):
             os.makedirs('uploads')
+        self.avatars.start()
 
         # 1. Database
         self.db = await aiosqlite.connect('bot.db')
         self.db.row_factory = aiosqlite.Row 
         await self.init_db()
+        await self.ranking.load(self.db)
+        await self.deadlines.load(self.db)
+        self.writer.start()
+        self.refresh.start()
+        self.promotions.start()
+        self.logs.start()
+        self.renderer.start()
+        self.prerender.start()
+        self.deadlines.start()
         
         # 2. Load Cogs
         for filename in os.listdir('./cogs'):
@@ -69,42 +108,18 @@ class CTFBot(commands.Bot):
 
     async def init_db(self):
         await self.db.execute("PRAGMA journal_mode=WAL;")
-        
-        # Comprehensive flags table
-        await self.db.execute('''CREATE TABLE IF NOT EXISTS flags
-                     (challenge_id TEXT PRIMARY KEY, flag_text TEXT, points INTEGER, category TEXT,
-                      msg_id INTEGER, file_msg_id INTEGER, channel_id INTEGER, image_url TEXT, posted_at INTEGER,
-                      start_time INTEGER, end_time INTEGER, description TEXT, 
-                      connection_info TEXT, file_path TEXT)''')
-
-        # Multi-column Migration
-        try:
-            await self.db.execute("SELECT file_msg_id FROM flags LIMIT 1")
-        except aiosqlite.OperationalError:
-            print("🛠️ Migrating database: Adding missing columns...")
-            migration_cmds = [
-                "ALTER TABLE flags ADD COLUMN start_time INTEGER",
-                "ALTER TABLE flags ADD COLUMN end_time INTEGER",
-                "ALTER TABLE flags ADD COLUMN description TEXT",
-                "ALTER TABLE flags ADD COLUMN connection_info TEXT",
-                "ALTER TABLE flags ADD COLUMN file_path TEXT",
-                "ALTER TABLE flags ADD COLUMN file_msg_id INTEGER"
-            ]
-            for cmd in migration_cmds:
-                try: await self.db.execute(cmd)
-                except: pass
-        
-        await self.db.execute('''CREATE TABLE IF NOT EXISTS role_rewards (role_id INTEGER PRIMARY KEY, points INTEGER)''')
-        await self.db.execute('''CREATE TABLE IF NOT EXISTS scores (user_id INTEGER PRIMARY KEY, username TEXT, points INTEGER)''')
-        await self.db.execute('''CREATE TABLE IF NOT EXISTS solves (user_id INTEGER, challenge_id TEXT, timestamp REAL, PRIMARY KEY (user_id, challenge_id))''')
-        await self.db.execute('''CREATE TABLE IF NOT EXISTS banlist (user_id INTEGER PRIMARY KEY)''')
-        await self.db.execute('''CREATE TABLE IF NOT EXISTS hints (id INTEGER PRIMARY KEY AUTOINCREMENT, challenge_id TEXT, hint_text TEXT, cost INTEGER)''')
-        await self.db.execute('''CREATE TABLE IF NOT EXISTS config (key TEXT PRIMARY KEY, value INTEGER)''')
-        await self.db.execute('''CREATE TABLE IF NOT EXISTS unlocked_hints (user_id INTEGER, hint_id INTEGER, PRIMARY KEY (user_id, hint_id))''')
-        await self.db.commit()
-        print("📂 bot.db initialized.")
+        # Versioned schema: applies only the steps this database has not seen yet
+        await migrate(self.db)
+        print(f"📂 bot.db initialized (schema v{LATEST}).")
 
     async def close(self):
+        self.refresh.stop()
+        self.promotions.stop()
+        self.prerender.stop()
+        self.deadlines.stop()
+        await self.logs.close()
+        await self.writer.close()
+        self.renderer.close()
         if self.db: await self.db.close()
         await super().close()
 